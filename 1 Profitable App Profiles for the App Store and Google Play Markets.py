@@ -22,21 +22,15 @@
 # In[1]:
 
 
-from csv import reader
+from app_profiles.loading import iter_rows, read_header
 
 ### The Google Play data set ###
-opened_file = open('E:/Dataquest Data Analyst Course/1 Python for Data Science Fundamentals/googleplaystore.csv',encoding='utf8')
-read_file = reader(opened_file)
-android = list(read_file)
-android_header = android[0]
-android = android[1:]
+android_header = read_header('googleplaystore.csv')
+android = list(iter_rows('googleplaystore.csv'))
 
 ### The App Store data set ###
-opened_file = open('E:/Dataquest Data Analyst Course/1 Python for Data Science Fundamentals/AppleStore.csv',encoding='utf8')
-read_file = reader(opened_file)
-ios = list(read_file)
-ios_header = ios[0]
-ios = ios[1:]
+ios_header = read_header('AppleStore.csv')
+ios = list(iter_rows('AppleStore.csv'))
 
 
 # To make them easier for you to explore, we created a function named explore_data() that you can repeatedly use to print rows in a readable way
@@ -128,13 +122,16 @@ print('\n')
 print(android[0])      # correct row
 
 
-# The row 10472 corresponds to the app Life Made WI-Fi Touchscreen Photo Frame, and we can see that the rating is 19. This is clearly off because the maximum rating for a Google Play app is 5. As a consequence, we'll delete this row.
+# The row 10472 corresponds to the app Life Made WI-Fi Touchscreen Photo Frame, and we can see that the rating is 19. This is clearly off because the maximum rating for a Google Play app is 5. As a consequence, we'll remove this row. Rather than deleting it by its index, which would remove the wrong row if the cell ran twice or the file changed, we check every row (number of columns, rating between 0 and 5, numeric reviews and price) and keep the rejected ones aside in `quarantine`.
 
 # In[6]:
 
 
+from app_profiles.validation import ANDROID_CHECKS, Quarantine, validate_rows
+
 print(len(android))
-del android[10472]  # don't run this more than once
+quarantine = Quarantine()
+android = list(validate_rows(android, android_header, ANDROID_CHECKS, quarantine))  # safe to rerun
 print(len(android))
 
 
@@ -606,10 +603,10 @@ for category in categories_android:
 # In[33]:
 
 
+from app_profiles.installs import at_least
+
 for app in android_final:
-    if app[1] == 'COMMUNICATION' and (app[5] == '1,000,000,000+'
-                                      or app[5] == '500,000,000+'
-                                      or app[5] == '100,000,000+'):
+    if app[1] == 'COMMUNICATION' and at_least(app[5], '100,000,000+'):
         print(app[0], ':', app[5])
 
 
@@ -654,9 +651,7 @@ for app in android_final:
 
 
 for app in android_final:
-    if app[1] == 'BOOKS_AND_REFERENCE' and (app[5] == '1,000,000,000+'
-                                            or app[5] == '500,000,000+'
-                                            or app[5] == '100,000,000+'):
+    if app[1] == 'BOOKS_AND_REFERENCE' and at_least(app[5], '100,000,000+'):
         print(app[0], ':', app[5])
 
 
@@ -666,10 +661,8 @@ for app in android_final:
 
 
 for app in android_final:
-    if app[1] == 'BOOKS_AND_REFERENCE' and (app[5] == '1,000,000+'
-                                            or app[5] == '5,000,000+'
-                                            or app[5] == '10,000,000+'
-                                            or app[5] == '50,000,000+'):
+    if app[1] == 'BOOKS_AND_REFERENCE' and (at_least(app[5], '1,000,000+')
+                                            and not at_least(app[5], '100,000,000+')):
         print(app[0], ':', app[5])
 
 
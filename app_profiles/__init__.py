@@ -0,0 +1,42 @@
+"""Reusable stages of the profitable app profiles analysis.
+
+The notebook walks through the analysis cell by cell; this package holds the
+same steps as functions that work on any iterable of rows, so they can be fed
+straight from a file without loading the whole data set first.
+
+The names below are imported from their modules on first use, so importing
+the package (or running `python -m app_profiles`) stays fast and only loads
+what a run needs.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'app_profiles.aggregate': ['below', 'group_aggregate', 'iqr_fences', 'robust_aggregate'],
+    'app_profiles.columnar': ['Categorical', 'ColumnTable', 'android_table', 'ios_table'],
+    'app_profiles.duplicates': ['approximate_duplicate_count', 'duplicate_report',
+                                'remove_duplicates'],
+    'app_profiles.filters': ['english_mask', 'english_only', 'free_only', 'is_english'],
+    'app_profiles.genres': ['GenreCounts'],
+    'app_profiles.index': ['GroupIndex'],
+    'app_profiles.loading': ['iter_rows', 'open_dataset', 'read_header'],
+    'app_profiles.sketches': ['HyperLogLog', 'SpaceSaving', 'TDigest'],
+    'app_profiles.tables': ['FreqCounter', 'display_table', 'explore_data', 'freq_table'],
+    'app_profiles.validation': ['ANDROID_CHECKS', 'IOS_CHECKS', 'Quarantine', 'validate_rows'],
+}
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_MODULES)
+
+
+def __getattr__(name):
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError('module %r has no attribute %r' % (__name__, name))
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,3 @@
+from app_profiles.cli import main
+
+main()
@@ -0,0 +1,193 @@
+/*
+ * Optional C versions of the row-level kernels in app_profiles.kernels.
+ *
+ * Each function takes a sequence of strings and returns a list. Any value
+ * the fast path does not handle exactly like the pure-Python code (an
+ * unexpected character, an overflow) is handed to the Python fallback, so
+ * the results are always identical.
+ *
+ * Build with: python setup.py build_ext --inplace
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+/* english_mask(names) -> [bool]: at most 3 characters above 127. */
+static PyObject *
+english_mask(PyObject *self, PyObject *names)
+{
+    PyObject *seq = PySequence_Fast(names, "names must be a sequence");
+    if (seq == NULL)
+        return NULL;
+
+    Py_ssize_t n = PySequence_Fast_GET_SIZE(seq);
+    PyObject **items = PySequence_Fast_ITEMS(seq);
+    PyObject *result = PyList_New(n);
+    if (result == NULL) {
+        Py_DECREF(seq);
+        return NULL;
+    }
+
+    for (Py_ssize_t i = 0; i < n; i++) {
+        PyObject *name = items[i];
+        if (!PyUnicode_Check(name)) {
+            PyErr_Format(PyExc_TypeError, "names must be str, not %.100s",
+                         Py_TYPE(name)->tp_name);
+            Py_DECREF(result);
+            Py_DECREF(seq);
+            return NULL;
+        }
+
+        int english = 1;
+        if (!PyUnicode_IS_ASCII(name)) {
+            int kind = PyUnicode_KIND(name);
+            const void *data = PyUnicode_DATA(name);
+            Py_ssize_t length = PyUnicode_GET_LENGTH(name);
+            int non_ascii = 0;
+            for (Py_ssize_t j = 0; j < length; j++) {
+                if (PyUnicode_READ(kind, data, j) > 127 && ++non_ascii > 3) {
+                    english = 0;
+                    break;
+                }
+            }
+        }
+
+        PyObject *flag = english ? Py_True : Py_False;
+        Py_INCREF(flag);
+        PyList_SET_ITEM(result, i, flag);
+    }
+
+    Py_DECREF(seq);
+    return result;
+}
+
+/* parse_installs(values, fallback) -> [int]: digits with ',' and '+' ignored. */
+static PyObject *
+parse_installs(PyObject *self, PyObject *args)
+{
+    PyObject *values, *fallback;
+    if (!PyArg_ParseTuple(args, "OO:parse_installs", &values, &fallback))
+        return NULL;
+
+    PyObject *seq = PySequence_Fast(values, "values must be a sequence");
+    if (seq == NULL)
+        return NULL;
+
+    Py_ssize_t n = PySequence_Fast_GET_SIZE(seq);
+    PyObject **items = PySequence_Fast_ITEMS(seq);
+    PyObject *result = PyList_New(n);
+    if (result == NULL) {
+        Py_DECREF(seq);
+        return NULL;
+    }
+
+    for (Py_ssize_t i = 0; i < n; i++) {
+        PyObject *value = items[i];
+        PyObject *parsed = NULL;
+
+        if (PyUnicode_Check(value) && PyUnicode_IS_ASCII(value)) {
+            const char *text = (const char *)PyUnicode_DATA(value);
+            Py_ssize_t length = PyUnicode_GET_LENGTH(value);
+            unsigned long long number = 0;
+            int digits = 0, plain = 1;
+
+            for (Py_ssize_t j = 0; j < length; j++) {
+                char c = text[j];
+                if (c >= '0' && c <= '9') {
+                    if (number > (ULLONG_MAX - 9) / 10) {
+                        plain = 0;
+                        break;
+                    }
+                    number = number * 10 + (unsigned long long)(c - '0');
+                    digits++;
+                }
+                else if (c != ',' && c != '+') {
+                    plain = 0;
+                    break;
+                }
+            }
+            if (plain && digits)
+                parsed = PyLong_FromUnsignedLongLong(number);
+            else
+                parsed = PyObject_CallOneArg(fallback, value);
+        }
+        else {
+            parsed = PyObject_CallOneArg(fallback, value);
+        }
+
+        if (parsed == NULL) {
+            Py_DECREF(result);
+            Py_DECREF(seq);
+            return NULL;
+        }
+        PyList_SET_ITEM(result, i, parsed);
+    }
+
+    Py_DECREF(seq);
+    return result;
+}
+
+/* parse_floats(values) -> [float]: float() of every value. */
+static PyObject *
+parse_floats(PyObject *self, PyObject *values)
+{
+    PyObject *seq = PySequence_Fast(values, "values must be a sequence");
+    if (seq == NULL)
+        return NULL;
+
+    Py_ssize_t n = PySequence_Fast_GET_SIZE(seq);
+    PyObject **items = PySequence_Fast_ITEMS(seq);
+    PyObject *result = PyList_New(n);
+    if (result == NULL) {
+        Py_DECREF(seq);
+        return NULL;
+    }
+
+    for (Py_ssize_t i = 0; i < n; i++) {
+        PyObject *value = items[i];
+        PyObject *parsed;
+        if (PyFloat_CheckExact(value)) {
+            Py_INCREF(value);
+            parsed = value;
+        }
+        else if (PyUnicode_Check(value)) {
+            parsed = PyFloat_FromString(value);
+        }
+        else {
+            parsed = PyNumber_Float(value);
+        }
+        if (parsed == NULL) {
+            Py_DECREF(result);
+            Py_DECREF(seq);
+            return NULL;
+        }
+        PyList_SET_ITEM(result, i, parsed);
+    }
+
+    Py_DECREF(seq);
+    return result;
+}
+
+static PyMethodDef speedups_methods[] = {
+    {"english_mask", english_mask, METH_O,
+     "english_mask(names) -> list of bools, see app_profiles.kernels."},
+    {"parse_installs", parse_installs, METH_VARARGS,
+     "parse_installs(values, fallback) -> list of ints, see app_profiles.kernels."},
+    {"parse_floats", parse_floats, METH_O,
+     "parse_floats(values) -> list of floats, see app_profiles.kernels."},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef speedups_module = {
+    PyModuleDef_HEAD_INIT,
+    "app_profiles._speedups",
+    "Optional C kernels for app_profiles.kernels.",
+    -1,
+    speedups_methods
+};
+
+PyMODINIT_FUNC
+PyInit__speedups(void)
+{
+    return PyModule_Create(&speedups_module);
+}
@@ -0,0 +1,169 @@
+"""Per-group aggregates (e.g. average installs per category) in one pass."""
+
+from array import array
+from bisect import bisect_left, bisect_right
+
+from app_profiles import kernels
+from app_profiles.columnar import ColumnTable
+from app_profiles.sketches import TDigest
+
+AGGREGATES = ('count', 'sum', 'mean', 'median', 'min', 'max')
+
+
+def _median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2
+
+
+def _pairs(dataset, key, value, parse):
+    if isinstance(dataset, ColumnTable):
+        return zip(dataset[key], dataset[value])
+    return _parsed_pairs(dataset, key, value, kernels.batch_parser(parse))
+
+
+def _parsed_pairs(rows, key, value, parse_batch):
+    for batch in kernels.batches(rows):
+        yield from zip([row[key] for row in batch], parse_batch([row[value] for row in batch]))
+
+
+def group_aggregate(dataset, key, value, aggs=('count', 'sum', 'mean'), parse=float,
+                    approximate=False, compression=100):
+    """Aggregate column `value` for every distinct value of column `key`.
+
+    `dataset` is either a list/iterator of rows, with `key` and `value`
+    being column indexes and `parse` turning the value strings into numbers,
+    or a ColumnTable, with `key` and `value` being column names (its numeric
+    columns are already parsed, so `parse` is ignored).
+
+    All groups are computed in a single pass over the data. Returns a
+    dictionary of group -> {aggregate name: result}, with the groups in the
+    order they first appear (the same order as `freq_table`).
+
+    The median needs every value of a group; with `approximate=True` it is
+    estimated with a TDigest of the given `compression` instead, so memory
+    per group stays bounded. The other aggregates are always exact.
+    """
+    for agg in aggs:
+        if agg not in AGGREGATES:
+            raise ValueError('unknown aggregate %r, expected one of %s' % (agg, AGGREGATES))
+
+    pairs = _pairs(dataset, key, value, parse)
+    keep_values = 'median' in aggs
+    keep_extremes = 'min' in aggs or 'max' in aggs
+    states = {}
+
+    for group, number in pairs:
+        state = states.get(group)
+        if state is None:
+            # [count, sum, min, max, values (or their digest)]
+            state = [0, 0, number, number, TDigest(compression) if approximate else []]
+            states[group] = state
+        state[0] += 1
+        state[1] += number
+        if keep_extremes:
+            if number < state[2]:
+                state[2] = number
+            elif number > state[3]:
+                state[3] = number
+        if keep_values:
+            if approximate:
+                state[4].add(number)
+            else:
+                state[4].append(number)
+
+    results = {}
+    for group, (count, total, smallest, largest, values) in states.items():
+        result = {}
+        for agg in aggs:
+            if agg == 'count':
+                result[agg] = count
+            elif agg == 'sum':
+                result[agg] = total
+            elif agg == 'mean':
+                result[agg] = total / count
+            elif agg == 'median':
+                result[agg] = values.median() if approximate else _median(values)
+            elif agg == 'min':
+                result[agg] = smallest
+            else:
+                result[agg] = largest
+        results[group] = result
+
+    return results
+
+
+def quantile(values, q):
+    """Return the quantile `q` (0 to 1) of sorted `values`, interpolating linearly."""
+    position = q * (len(values) - 1)
+    lower = int(position)
+    if lower + 1 >= len(values):
+        return values[lower]
+    return values[lower] + (values[lower + 1] - values[lower]) * (position - lower)
+
+
+def below(limit):
+    """Outlier rule: keep only values below `limit`.
+
+    `below(100000000)` is the notebook's `under_100_m` filter.
+    """
+    def rule(values):
+        return 0, bisect_left(values, limit)
+    return rule
+
+
+def iqr_fences(k=1.5):
+    """Outlier rule: keep values within `k` interquartile ranges of the quartiles."""
+    def rule(values):
+        q1 = quantile(values, 0.25)
+        q3 = quantile(values, 0.75)
+        spread = q3 - q1
+        return bisect_left(values, q1 - k * spread), bisect_right(values, q3 + k * spread)
+    return rule
+
+
+def robust_aggregate(dataset, key, value, parse=float, trim=0.1,
+                     quantiles=(0.9, 0.99), outliers=None):
+    """Outlier-resistant statistics of column `value` for every group of column `key`.
+
+    Takes the same `dataset`, `key`, `value` and `parse` as
+    `group_aggregate`. The values are collected per group in one pass and
+    sorted once; all statistics are then read off the sorted values. With an
+    `outliers` rule (`below(limit)`, `iqr_fences(k)`, or any function taking
+    the sorted values and returning the `(start, end)` slice to keep), the
+    statistics only use the kept values.
+
+    For every group the result has 'count' (all values), 'kept',
+    'mean', 'median', 'trimmed_mean' (leaving out the lowest and highest
+    `trim` share) and one 'p<percent>' entry per quantile, e.g. 'p90'. A
+    group whose values are all excluded only has 'count' and 'kept'.
+    """
+    groups = {}
+    for group, number in _pairs(dataset, key, value, parse):
+        values = groups.get(group)
+        if values is None:
+            values = groups[group] = array('d')
+        values.append(number)
+
+    results = {}
+    for group, values in groups.items():
+        values = sorted(values)
+        result = {'count': len(values)}
+        if outliers is not None:
+            start, end = outliers(values)
+            values = values[start:end]
+        result['kept'] = len(values)
+
+        if values:
+            n_trimmed = int(len(values) * trim)
+            trimmed = values[n_trimmed:len(values) - n_trimmed] or values
+            result['mean'] = sum(values) / len(values)
+            result['median'] = quantile(values, 0.5)
+            result['trimmed_mean'] = sum(trimmed) / len(trimmed)
+            for q in quantiles:
+                result['p%g' % (q * 100)] = quantile(values, q)
+        results[group] = result
+
+    return results
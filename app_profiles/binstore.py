@@ -0,0 +1,249 @@
+"""A compact binary file format for the app tables, read through `mmap`.
+
+Loading the CSV files turns every field into a Python str. A table file
+instead holds each column as one contiguous block, so opening it is only a
+`mmap` call and a column is read when (and only when) it is used:
+
+* numeric columns are float64 arrays, exposed as zero-copy memoryviews;
+* dictionary-encoded columns are int32 codes, with the distinct values
+  stored in the file's header;
+* text columns are a heap of UTF-8 bytes plus int64 start offsets (one
+  more offset than rows); a value is decoded when it is accessed.
+
+Layout: the magic bytes, the length of a JSON header (little-endian uint64),
+the JSON header describing every column's kind and the position of its
+blocks (relative to the first block), then the column blocks, each starting
+on an 8-byte boundary. Numbers are stored in
+the byte order of the machine that wrote the file, which is recorded in the
+header and checked when opening.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from app_profiles.columnar import (ANDROID_CATEGORICAL, ANDROID_NUMERIC, Categorical,
+                                   ColumnTable, IOS_CATEGORICAL, IOS_NUMERIC)
+from app_profiles.loading import iter_rows, read_header
+from app_profiles.validation import ANDROID_CHECKS, IOS_CHECKS, table_checks, validate_rows
+
+MAGIC = b'APPTBL1\n'
+ALIGNMENT = 8
+
+
+class StringColumn:
+    """A read-only text column stored as an offset array plus a UTF-8 heap."""
+
+    def __init__(self, offsets, heap):
+        self.offsets = offsets
+        self.heap = heap
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        start = self.offsets[position]
+        end = self.offsets[position + 1]
+        return str(self.heap[start:end], 'utf8')
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+
+class MappedTable(ColumnTable):
+    """A ColumnTable whose columns are views into a memory-mapped table file.
+
+    Call `close` (or use it as a context manager) once done; the columns
+    cannot be used afterwards, and slices taken from the numeric columns
+    must be released first.
+    """
+
+    def __init__(self, header, columns, mapped_file, opened_file, views, layout):
+        super().__init__(header, columns)
+        self._mmap = mapped_file
+        self._file = opened_file
+        # Released in reverse order of creation, derived views first.
+        self._views = views
+        # Where the columns are in the file, to map them again.
+        self._layout = layout
+
+    def close(self):
+        """Unmap the file and close it.
+
+        Raises BufferError, leaving the table open and usable, while slices
+        of its columns are still alive. Columns fetched before the failed
+        call must be fetched again.
+        """
+        if self._mmap.closed:
+            return
+        for view in reversed(self._views):
+            view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # A live slice keeps the mapping exported, which only shows once
+            # our own views are released: map the columns again so the table
+            # is not left half-closed.
+            self.header, self.columns, self._views = _map_columns(self._mmap, *self._layout)
+            raise BufferError('release the slices taken from the columns before closing the table')
+        self._views = []
+        self.columns = {}
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _padding(offset):
+    return -offset % ALIGNMENT
+
+
+def write_table(table, path):
+    """Write the ColumnTable `table` to a table file at `path`."""
+    n_rows = len(table)
+    blocks = []
+    description = []
+    offset = 0
+
+    for name in table.header:
+        column = table[name]
+        if isinstance(column, Categorical):
+            codes = array('i', column.codes)
+            parts = [codes.tobytes()]
+            entry = {'name': name, 'kind': 'category', 'categories': column.categories}
+        elif isinstance(column, (array, memoryview)):
+            parts = [array('d', column).tobytes()]
+            entry = {'name': name, 'kind': 'float64'}
+        else:
+            encoded = [value.encode('utf8') for value in column]
+            offsets = array('q', [0])
+            end = 0
+            for value in encoded:
+                end += len(value)
+                offsets.append(end)
+            parts = [offsets.tobytes(), b''.join(encoded)]
+            entry = {'name': name, 'kind': 'string'}
+
+        entry['blocks'] = []
+        for part in parts:
+            entry['blocks'].append([offset, len(part)])
+            blocks.append(part + b'\0' * _padding(len(part)))
+            offset += len(part) + _padding(len(part))
+        description.append(entry)
+
+    header = json.dumps({'byteorder': sys.byteorder, 'n_rows': n_rows,
+                         'columns': description}).encode('utf8')
+    start = len(MAGIC) + 8 + len(header)
+    start += _padding(start)
+
+    with open(path, 'wb') as output_file:
+        output_file.write(MAGIC)
+        output_file.write(struct.pack('<Q', len(header)))
+        output_file.write(header)
+        output_file.write(b'\0' * (start - len(MAGIC) - 8 - len(header)))
+        for block in blocks:
+            output_file.write(block)
+
+
+def open_table(path):
+    """Open the table file at `path` as a MappedTable, without reading the data."""
+    opened_file = open(path, 'rb')
+    try:
+        mapped_file = mmap.mmap(opened_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # mmap refuses empty files
+        opened_file.close()
+        raise ValueError('%s is not a table file' % path)
+
+    if mapped_file[:len(MAGIC)] != MAGIC:
+        mapped_file.close()
+        opened_file.close()
+        raise ValueError('%s is not a table file' % path)
+
+    (header_length,) = struct.unpack_from('<Q', mapped_file, len(MAGIC))
+    header_start = len(MAGIC) + 8
+    header = json.loads(str(mapped_file[header_start:header_start + header_length], 'utf8'))
+    if header['byteorder'] != sys.byteorder:
+        mapped_file.close()
+        opened_file.close()
+        raise ValueError('%s was written on a %s-endian machine'
+                         % (path, header['byteorder']))
+
+    start = header_start + header_length
+    start += _padding(start)
+    layout = (start, header['columns'])
+    names, columns, views = _map_columns(mapped_file, *layout)
+    return MappedTable(names, columns, mapped_file, opened_file, views, layout)
+
+
+def _map_columns(mapped_file, start, entries):
+    """Return `(names, columns, views)` for the column `entries` of a table file header."""
+    whole = memoryview(mapped_file)
+    views = [whole]
+
+    def block(position, typecode):
+        offset, length = position
+        view = whole[start + offset:start + offset + length]
+        views.append(view)
+        if typecode is None:
+            return view
+        typed = view.cast(typecode)
+        views.append(typed)
+        return typed
+
+    columns = {}
+    names = []
+    for entry in entries:
+        names.append(entry['name'])
+        if entry['kind'] == 'float64':
+            columns[entry['name']] = block(entry['blocks'][0], 'd')
+        elif entry['kind'] == 'category':
+            codes = block(entry['blocks'][0], 'i')
+            columns[entry['name']] = Categorical(entry['categories'], codes)
+        else:
+            offsets = block(entry['blocks'][0], 'q')
+            heap = block(entry['blocks'][1], None)
+            columns[entry['name']] = StringColumn(offsets, heap)
+
+    return names, columns, views
+
+
+def convert_csv(csv_path, table_path, numeric, categorical, checks=(), quarantine=None):
+    """Convert a store CSV file to a table file; returns the number of rows.
+
+    `numeric` and `categorical` describe the columns as for
+    `ColumnTable.from_rows`. Rows are checked with `validate_rows` against
+    `checks` (e.g. `ANDROID_CHECKS`) and against every `numeric` column's
+    parser; rows that fail are skipped, or added to `quarantine` if one is
+    given.
+    """
+    header = read_header(csv_path)
+    rows = validate_rows(iter_rows(csv_path), header, table_checks(numeric, checks), quarantine)
+    table = ColumnTable.from_rows(header, rows, numeric, categorical)
+    temporary_path = '%s.%d.tmp' % (table_path, os.getpid())
+    write_table(table, temporary_path)
+    os.replace(temporary_path, table_path)
+    return len(table)
+
+
+def convert_android(csv_path, table_path, quarantine=None):
+    """Convert googleplaystore.csv (or a shard of it) to a table file."""
+    return convert_csv(csv_path, table_path, ANDROID_NUMERIC, ANDROID_CATEGORICAL,
+                       ANDROID_CHECKS, quarantine)
+
+
+def convert_ios(csv_path, table_path, quarantine=None):
+    """Convert AppleStore.csv (or a shard of it) to a table file."""
+    return convert_csv(csv_path, table_path, IOS_NUMERIC, IOS_CATEGORICAL, IOS_CHECKS,
+                       quarantine)
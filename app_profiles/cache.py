@@ -0,0 +1,100 @@
+"""On-disk cache of the cleaned data sets.
+
+Cleaning a store dump (dropping malformed rows, deduplication, the English
+and free filters) only depends on the input files and the cleaning
+parameters, so its result is stored under a key made from a hash of both.
+A later run with unchanged inputs reads the cleaned rows back instead of
+redoing the cleaning; changing a file or a parameter changes the key and the
+data is rebuilt.
+"""
+
+import hashlib
+import json
+import os
+
+from app_profiles.binstore import open_table, write_table
+from app_profiles.columnar import ColumnTable
+from app_profiles.loading import iter_rows, read_header, write_rows
+from app_profiles.pipeline import clean_store, clean_store_parallel
+
+# Bump when the cleaning code changes in a way that changes its output.
+CACHE_VERSION = 1
+
+
+def file_fingerprint(path, chunk_size=1 << 20):
+    """Return the SHA-256 hex digest of the contents of the file at `path`."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as opened_file:
+        chunk = opened_file.read(chunk_size)
+        while chunk:
+            digest.update(chunk)
+            chunk = opened_file.read(chunk_size)
+    return digest.hexdigest()
+
+
+def cache_key(paths, store, **parameters):
+    """Return the cache key for cleaning the files at `paths` with `store`.
+
+    Any extra keyword `parameters` (they must be JSON-serializable) are part
+    of the key too.
+    """
+    description = {
+        'version': CACHE_VERSION,
+        'files': [file_fingerprint(path) for path in paths],
+        'store': store,
+        'parameters': parameters,
+    }
+    encoded = json.dumps(description, sort_keys=True).encode('utf8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def cached_clean(paths, store, cache_dir, parallel=False, max_workers=None):
+    """Return `(header, rows)` of the cleaned shards at `paths`, using the cache.
+
+    On a miss the shards are cleaned (in worker processes if `parallel`)
+    and the result is written to `cache_dir`. The file is written under a
+    temporary name and renamed, so an interrupted run never leaves a
+    truncated entry behind.
+    """
+    cache_path = os.path.join(cache_dir, cache_key(paths, store) + '.csv')
+
+    if os.path.exists(cache_path):
+        return read_header(cache_path), list(iter_rows(cache_path))
+
+    header, rows = _clean(paths, store, parallel, max_workers)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    temporary_path = '%s.%d.tmp' % (cache_path, os.getpid())
+    write_rows(temporary_path, header, rows)
+    os.replace(temporary_path, cache_path)
+    return header, rows
+
+
+def cached_table(paths, store, cache_dir, numeric, categorical=(),
+                 parallel=False, max_workers=None):
+    """Return the cleaned shards at `paths` as a memory-mapped table, using the cache.
+
+    Like `cached_clean`, but the cache entry is a binary table file (see
+    `app_profiles.binstore`) with the columns typed by `numeric` and
+    `categorical`, and a warm run only maps the file instead of reading
+    any rows. The column types are part of the cache key.
+    """
+    key = cache_key(paths, store, numeric=sorted(numeric), categorical=sorted(categorical))
+    cache_path = os.path.join(cache_dir, key + '.table')
+
+    if not os.path.exists(cache_path):
+        header, rows = _clean(paths, store, parallel, max_workers)
+        table = ColumnTable.from_rows(header, rows, numeric, categorical)
+
+        os.makedirs(cache_dir, exist_ok=True)
+        temporary_path = '%s.%d.tmp' % (cache_path, os.getpid())
+        write_table(table, temporary_path)
+        os.replace(temporary_path, cache_path)
+
+    return open_table(cache_path)
+
+
+def _clean(paths, store, parallel, max_workers):
+    if parallel:
+        return clean_store_parallel(paths, store, max_workers)
+    return clean_store(paths, store)
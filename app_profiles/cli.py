@@ -0,0 +1,242 @@
+"""Command-line entry point: `python -m app_profiles`.
+
+Runs selected sections of the analysis on the given store files and prints
+the results as JSON (nested by section, store and metric) or CSV (one line
+per value: section, store, metric, key, value).
+
+    python -m app_profiles --android googleplaystore.csv --ios AppleStore.csv \\
+        --section genres --section averages --format csv
+
+Only the modules a section needs are imported, and a store file is only
+read (and cleaned) if a selected section uses it, so narrow reports start
+quickly.
+
+With `--profile`, every cleaning step and every section is timed and a
+table of the stages is printed to stderr; `--cprofile-stage dedup` also
+writes cProfile statistics of that stage to dedup.prof.
+"""
+
+import argparse
+import json
+import sys
+
+SECTIONS = ('dedup', 'genres', 'averages', 'drilldowns')
+
+# The notebook's drill-downs.
+DEFAULT_CATEGORIES = {
+    'android': ['COMMUNICATION', 'BOOKS_AND_REFERENCE'],
+    'ios': ['Navigation', 'Reference'],
+}
+
+
+class Inputs:
+    """The store files, read and cleaned at most once, on first use."""
+
+    def __init__(self, android=None, ios=None, profiler=None):
+        self.paths = {'android': android, 'ios': ios}
+        self.profiler = profiler
+        self._cleaned = {}
+
+    def stores(self):
+        return [store for store in ('android', 'ios') if self.paths[store]]
+
+    def validated(self, store):
+        from app_profiles.loading import iter_rows, read_header
+        from app_profiles.validation import CHECKS, validate_rows
+
+        path = self.paths[store]
+        return validate_rows(iter_rows(path), read_header(path), CHECKS[store])
+
+    def cleaned(self, store):
+        if store not in self._cleaned:
+            from app_profiles.pipeline import STORES, clean_store
+
+            self._cleaned[store] = clean_store([self.paths[store]], STORES[store],
+                                               profiler=self.profiler)[1]
+        return self._cleaned[store]
+
+
+def dedup_section(inputs, options):
+    from app_profiles import columns
+    from app_profiles.duplicates import duplicate_report
+
+    names = {'android': columns.ANDROID_NAME, 'ios': columns.IOS_NAME}
+    n_examples = 15 if options.limit is None else options.limit
+    results = {}
+    for store in inputs.stores():
+        report = duplicate_report(inputs.validated(store), names[store], n_examples)
+        results[store] = {
+            'duplicate_rows': report['n_duplicates'],
+            'duplicated_apps': len(report['counts']),
+            'examples': report['examples'],
+        }
+    return results
+
+
+def genres_section(inputs, options):
+    from app_profiles import columns
+    from app_profiles.tables import display_table
+
+    tables = {
+        'android': {'Category': columns.ANDROID_CATEGORY, 'Genres': columns.ANDROID_GENRES},
+        'ios': {'prime_genre': columns.IOS_GENRE},
+    }
+    results = {}
+    for store in inputs.stores():
+        results[store] = {}
+        for name, index in tables[store].items():
+            entries = display_table(inputs.cleaned(store), index, options.limit, show=False)
+            results[store][name] = dict(entries)
+    return results
+
+
+def averages_section(inputs, options):
+    from app_profiles import columns
+    from app_profiles.aggregate import group_aggregate
+    from app_profiles.installs import parse_installs
+
+    averages = {
+        'android': ('average_installs', columns.ANDROID_CATEGORY, columns.ANDROID_INSTALLS,
+                    parse_installs),
+        'ios': ('average_ratings', columns.IOS_GENRE, columns.IOS_RATING_COUNT, float),
+    }
+    results = {}
+    for store in inputs.stores():
+        metric, key, value, parse = averages[store]
+        groups = group_aggregate(inputs.cleaned(store), key, value, ('mean',), parse)
+        results[store] = {metric: {group: groups[group]['mean'] for group in groups}}
+    return results
+
+
+def drilldowns_section(inputs, options):
+    from app_profiles import columns
+    from app_profiles.index import GroupIndex
+    from app_profiles.installs import parse_installs
+
+    indexes = {
+        'android': (columns.ANDROID_CATEGORY, columns.ANDROID_INSTALLS, parse_installs,
+                    columns.ANDROID_NAME),
+        'ios': (columns.IOS_GENRE, columns.IOS_RATING_COUNT, float, columns.IOS_NAME),
+    }
+    results = {}
+    for store in inputs.stores():
+        key, sort_by, parse, name = indexes[store]
+        rows = inputs.cleaned(store)
+        index = GroupIndex(rows, key, sort_by, parse)
+        categories = options.category or DEFAULT_CATEGORIES[store]
+        results[store] = {}
+        for category in categories:
+            if category in index:
+                top = index.rows(category, limit=options.limit, at_least=options.at_least)
+                # Pairs, not a dictionary: different apps can share a name.
+                results[store][category] = [[row[name], parse(row[sort_by])] for row in top]
+    return results
+
+
+SECTION_FUNCTIONS = {
+    'dedup': dedup_section,
+    'genres': genres_section,
+    'averages': averages_section,
+    'drilldowns': drilldowns_section,
+}
+
+
+def flatten(report):
+    """Yield `(section, store, metric, key, value)` for every value of a report.
+
+    In a list of `[key, value]` pairs (the drill-downs) the pair gives the
+    key and value; in other lists the key is the position.
+    """
+    for section, stores in report.items():
+        for store, metrics in stores.items():
+            for metric, value in metrics.items():
+                if isinstance(value, dict):
+                    for key, item in value.items():
+                        yield section, store, metric, key, item
+                elif isinstance(value, list):
+                    for position, item in enumerate(value):
+                        if isinstance(item, list):
+                            yield section, store, metric, item[0], item[1]
+                        else:
+                            yield section, store, metric, position, item
+                else:
+                    yield section, store, metric, '', value
+
+
+def write_report(report, output, output_format):
+    if output_format == 'json':
+        json.dump(report, output, indent=2, ensure_ascii=False)
+        output.write('\n')
+    else:
+        import csv
+
+        write_file = csv.writer(output)
+        write_file.writerow(['section', 'store', 'metric', 'key', 'value'])
+        write_file.writerows(flatten(report))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m app_profiles',
+        description='Profitable app profiles: report on Google Play and App Store data.')
+    parser.add_argument('--android', metavar='CSV', help='Google Play file (googleplaystore.csv)')
+    parser.add_argument('--ios', metavar='CSV', help='App Store file (AppleStore.csv)')
+    parser.add_argument('--section', action='append', choices=SECTIONS,
+                        help='section to run; repeat for several (default: all)')
+    parser.add_argument('--format', choices=('json', 'csv'), default='json')
+    parser.add_argument('--output', metavar='FILE', help='write here instead of stdout')
+    parser.add_argument('--limit', type=int, default=None,
+                        help='keep only this many entries per table/drill-down '
+                             '(and duplicate examples; default 15 there)')
+    parser.add_argument('--category', action='append',
+                        help='category/genre to drill down into; repeat for several')
+    parser.add_argument('--at-least', type=float, default=None,
+                        help='drill-downs: minimum installs (Google Play) or ratings (App Store)')
+    parser.add_argument('--profile', action='store_true',
+                        help='time every cleaning step and section; print the table to stderr')
+    parser.add_argument('--cprofile-stage', metavar='STAGE',
+                        help='run this stage under cProfile and write STAGE.prof: a cleaning '
+                             'step (load, validate, english_only, dedup, merge, free_only), '
+                             '"section" for all sections or e.g. "section genres"')
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    options = parser.parse_args(argv)
+    if not options.android and not options.ios:
+        parser.error('give at least one of --android and --ios')
+
+    sections = options.section or list(SECTIONS)
+    profiler = None
+    if options.profile or options.cprofile_stage:
+        from app_profiles.profiling import Profiler
+
+        profiler = Profiler(cprofile_stage=options.cprofile_stage)
+    inputs = Inputs(options.android, options.ios, profiler)
+
+    report = {}
+    if profiler is not None and set(sections) - {'dedup'}:
+        # Clean up front, so the cleaning steps are not counted again
+        # inside the first section that needs them.
+        for store in inputs.stores():
+            inputs.cleaned(store)
+    for section in SECTIONS:
+        if section in sections:
+            if profiler is None:
+                report[section] = SECTION_FUNCTIONS[section](inputs, options)
+            else:
+                with profiler.stage('section %s' % section):
+                    report[section] = SECTION_FUNCTIONS[section](inputs, options)
+
+    if options.output:
+        with open(options.output, 'w', encoding='utf8', newline='') as output:
+            write_report(report, output, options.format)
+    else:
+        write_report(report, sys.stdout, options.format)
+    if options.profile:
+        profiler.summary(output=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
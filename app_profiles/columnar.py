@@ -0,0 +1,183 @@
+"""A column-oriented, typed table for the cleaned data sets.
+
+Each numeric column is parsed once, when the table is built, into an
+`array.array` of doubles; low-cardinality text columns (Category, Genres,
+prime_genre, ...) are dictionary-encoded as integer codes plus a list of the
+distinct values. Other columns are kept as lists of strings. Aggregations can
+then work directly on typed arrays instead of re-parsing strings at every
+use, and a table takes a fraction of the memory of a list of lists of str.
+"""
+
+from array import array
+
+from app_profiles import kernels
+from app_profiles.installs import parse_installs
+
+
+def parse_price(price):
+    """Return a Google Play ('$4.99') or App Store ('4.99') price as a float."""
+    return float(price.lstrip('$'))
+
+
+# Column name -> parser for the numeric columns, and the dictionary-encoded
+# columns, of each store.
+ANDROID_NUMERIC = {
+    'Rating': float,
+    'Reviews': float,
+    'Installs': parse_installs,
+    'Price': parse_price,
+}
+ANDROID_CATEGORICAL = ('Category', 'Type', 'Content Rating', 'Genres')
+
+IOS_NUMERIC = {
+    'size_bytes': float,
+    'price': parse_price,
+    'rating_count_tot': float,
+    'rating_count_ver': float,
+    'user_rating': float,
+    'user_rating_ver': float,
+}
+IOS_CATEGORICAL = ('currency', 'cont_rating', 'prime_genre')
+
+
+class Categorical:
+    """A dictionary-encoded text column: integer codes into `categories`."""
+
+    def __init__(self, categories=None, codes=None):
+        self.categories = list(categories or [])
+        self.codes = codes if codes is not None else array('l')
+        self._lookup = {}
+        for code, value in enumerate(self.categories):
+            self._lookup[value] = code
+
+    def append(self, value):
+        code = self._lookup.get(value)
+        if code is None:
+            code = len(self.categories)
+            self._lookup[value] = code
+            self.categories.append(value)
+        self.codes.append(code)
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    def code_of(self, value):
+        """Return the code of `value`, or None if it never occurs."""
+        return self._lookup.get(value)
+
+    def value_counts(self):
+        """Return a dictionary of value -> number of rows, in a single pass."""
+        counts = [0] * len(self.categories)
+        for code in self.codes:
+            counts[code] += 1
+
+        table = {}
+        for code, value in enumerate(self.categories):
+            table[value] = counts[code]
+        return table
+
+    def take(self, positions):
+        codes = array('l', [self.codes[i] for i in positions])
+        return Categorical(self.categories, codes)
+
+    def __getitem__(self, position):
+        return self.categories[self.codes[position]]
+
+    def __iter__(self):
+        categories = self.categories
+        for code in self.codes:
+            yield categories[code]
+
+    def __len__(self):
+        return len(self.codes)
+
+
+class ColumnTable:
+    """Named columns of equal length, built once from CSV rows."""
+
+    def __init__(self, header, columns):
+        self.header = list(header)
+        self.columns = columns
+
+    @classmethod
+    def from_rows(cls, header, rows, numeric=None, categorical=()):
+        """Build a table from `rows`, parsing every column exactly once.
+
+        `numeric` maps column names to the function that parses them (e.g.
+        `float`); the names in `categorical` are dictionary-encoded. `rows`
+        is consumed in a single pass and can be a generator. It is read in
+        batches, and `float` and `parse_installs` columns are parsed a batch
+        at a time with `kernels`.
+        """
+        numeric = numeric or {}
+        columns = {}
+        extenders = []
+        for name in header:
+            if name in numeric:
+                column = array('d')
+                parse = kernels.batch_parser(numeric[name])
+                extend = column.extend
+                extenders.append(lambda values, extend=extend, parse=parse: extend(parse(values)))
+            elif name in categorical:
+                column = Categorical()
+                extenders.append(column.extend)
+            else:
+                column = []
+                extenders.append(column.extend)
+            columns[name] = column
+
+        n_columns = len(extenders)
+        for batch in kernels.batches(rows):
+            for row in batch:
+                if len(row) != n_columns:
+                    raise ValueError('expected %d columns, got %d: %r'
+                                     % (n_columns, len(row), row))
+            for position, extend in enumerate(extenders):
+                extend([row[position] for row in batch])
+
+        return cls(header, columns)
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __len__(self):
+        if not self.header:
+            return 0
+        return len(self.columns[self.header[0]])
+
+    def row(self, position):
+        """Return row `position` as a list of (typed) values."""
+        return [self.columns[name][position] for name in self.header]
+
+    def rows(self):
+        for position in range(len(self)):
+            yield self.row(position)
+
+    def take(self, positions):
+        """Return a new table holding only the rows at `positions`."""
+        positions = list(positions)
+        columns = {}
+        for name in self.header:
+            column = self.columns[name]
+            if isinstance(column, Categorical):
+                columns[name] = column.take(positions)
+            elif isinstance(column, (array, memoryview)):
+                columns[name] = array('d', [column[i] for i in positions])
+            else:
+                columns[name] = [column[i] for i in positions]
+        return ColumnTable(self.header, columns)
+
+    def filter(self, mask):
+        """Return a new table with the rows where `mask` is true."""
+        return self.take(position for position, keep in enumerate(mask) if keep)
+
+
+def android_table(header, rows):
+    """Build a typed table from Google Play rows."""
+    return ColumnTable.from_rows(header, rows, ANDROID_NUMERIC, ANDROID_CATEGORICAL)
+
+
+def ios_table(header, rows):
+    """Build a typed table from App Store rows."""
+    return ColumnTable.from_rows(header, rows, IOS_NUMERIC, IOS_CATEGORICAL)
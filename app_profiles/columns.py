@@ -0,0 +1,18 @@
+"""Column positions in the two store data sets."""
+
+# googleplaystore.csv
+ANDROID_NAME = 0
+ANDROID_CATEGORY = 1
+ANDROID_RATING = 2
+ANDROID_REVIEWS = 3
+ANDROID_INSTALLS = 5
+ANDROID_PRICE = 7
+ANDROID_GENRES = 9
+ANDROID_FREE_PRICE = '0'
+
+# AppleStore.csv
+IOS_NAME = 1
+IOS_PRICE = 4
+IOS_RATING_COUNT = 5
+IOS_GENRE = 11
+IOS_FREE_PRICE = '0.0'
@@ -0,0 +1,129 @@
+"""Finding and removing apps that appear more than once."""
+
+from operator import itemgetter
+
+from app_profiles import kernels
+
+
+def duplicate_report(dataset, index=0, n_examples=15):
+    """Count the apps whose name (column `index`) appears more than once.
+
+    Returns a dictionary with:
+
+    * 'n_duplicates': the number of extra rows, i.e. rows whose name was
+      already seen earlier in `dataset`;
+    * 'counts': the number of rows for every duplicated name;
+    * 'examples': the first `n_examples` duplicate rows' names, in the order
+      they were met.
+
+    Names are tracked in a dictionary, so the scan is a single linear pass
+    and `dataset` can be a row generator.
+    """
+    seen = {}
+    n_duplicates = 0
+    examples = []
+
+    for row in dataset:
+        name = row[index]
+        if name in seen:
+            seen[name] += 1
+            n_duplicates += 1
+            if len(examples) < n_examples:
+                examples.append(name)
+        else:
+            seen[name] = 1
+
+    counts = {}
+    for name in seen:
+        if seen[name] > 1:
+            counts[name] = seen[name]
+
+    return {'n_duplicates': n_duplicates,
+            'counts': counts,
+            'examples': examples}
+
+
+def approximate_duplicate_count(dataset, index=0, precision=14):
+    """Estimate the number of duplicate rows in bounded memory.
+
+    Returns a dictionary with the exact 'n_rows', the estimated number of
+    distinct names 'n_distinct' (a HyperLogLog of the given `precision`,
+    see `app_profiles.sketches`) and 'n_duplicates', their difference.
+    Unlike `duplicate_report`, memory does not grow with the number of
+    apps, but there are no per-name counts.
+    """
+    from app_profiles.sketches import HyperLogLog
+
+    distinct = HyperLogLog(precision)
+    n_rows = 0
+    for row in dataset:
+        n_rows += 1
+        distinct.add(row[index])
+
+    n_distinct = min(n_rows, round(distinct.count()))
+    return {'n_rows': n_rows,
+            'n_distinct': n_distinct,
+            'n_duplicates': n_rows - n_distinct}
+
+
+def best_rows(dataset, key=0, winner=3):
+    """Return the winning row per key as a dictionary key -> (value, position, row).
+
+    See `remove_duplicates` for `key` and `winner`. `position` is the row's
+    index in `dataset`; it decides ties and the output order. The result of
+    separate shards can be combined with `merge_best_rows`.
+
+    The `winner` values are parsed a batch at a time with
+    `kernels.parse_floats`.
+    """
+    if isinstance(key, int):
+        key = (key,)
+    get_key = itemgetter(*key)
+
+    best = {}
+    position = 0
+    for batch in kernels.batches(dataset):
+        values = kernels.parse_floats([row[winner] for row in batch])
+        for row, n_reviews in zip(batch, values):
+            app_key = get_key(row)
+            if app_key not in best or best[app_key][0] < n_reviews:
+                best[app_key] = (n_reviews, position, row)
+            position += 1
+
+    return best
+
+
+def merge_best_rows(partials):
+    """Combine the `best_rows` results of consecutive shards of one data set.
+
+    `partials` must be in shard order. The result maps each key to
+    `(value, shard, position, row)`; as within a shard, a later row only
+    replaces the current winner when its value is strictly higher, so the
+    merge gives the same winners as running `best_rows` over the shards
+    concatenated.
+    """
+    merged = {}
+    for shard, best in enumerate(partials):
+        for app_key, (n_reviews, position, row) in best.items():
+            current = merged.get(app_key)
+            if current is None or current[0] < n_reviews:
+                merged[app_key] = (n_reviews, shard, position, row)
+    return merged
+
+
+def remove_duplicates(dataset, key=0, winner=3):
+    """Keep one row per app: the one with the highest value in column `winner`.
+
+    `key` is the column index identifying an app (0, the name, for Google
+    Play) or a tuple of indexes, e.g. `(0, 1)` for name and category. The
+    default `winner` is the Reviews column; use 5 (`rating_count_tot`) for
+    the App Store.
+
+    `dataset` is read in a single pass, keeping the current winner per key
+    in a dictionary, so only the unique rows are ever held in memory. When
+    several rows tie for the highest value (like the three identical Box
+    rows) the earliest one wins. The kept rows are returned in their
+    original order.
+    """
+    kept = sorted(best_rows(dataset, key, winner).values(), key=itemgetter(1))
+    return [entry[2] for entry in kept]
@@ -0,0 +1,57 @@
+"""Row filters used to keep only English, free apps."""
+
+
+def is_english(string):
+    """Return False when `string` has more than 3 non-ASCII characters.
+
+    Up to 3 are tolerated so names with an emoji or a ™ sign are kept.
+    """
+    non_ascii = 0
+
+    for character in string:
+        if ord(character) > 127:
+            non_ascii += 1
+
+    if non_ascii > 3:
+        return False
+    else:
+        return True
+
+
+def _looks_english(name):
+    # Same result as `is_english`; see `english_mask`.
+    return name.isascii() or len(name) - len(name.encode('ascii', 'ignore')) <= 3
+
+
+def english_mask(names):
+    """Return a list of booleans, `is_english(name)` for each of `names`.
+
+    Instead of calling `ord()` on every character, each name is encoded to
+    ASCII with the non-ASCII characters dropped; the length difference is
+    the number of characters above 127. Both steps run in C, and names that
+    are pure ASCII (nearly all of them) are accepted by `str.isascii()`
+    without encoding at all.
+    """
+    return [_looks_english(name) for name in names]
+
+
+def english_only(rows, index):
+    """Yield the rows whose column `index` (the app name) looks English.
+
+    The rows are read in batches and their names checked with
+    `kernels.english_mask`, which uses the C extension when it is built.
+    """
+    # Imported here: kernels uses english_mask as its pure-Python path.
+    from app_profiles import kernels
+
+    for batch in kernels.batches(rows):
+        for row, english in zip(batch, kernels.english_mask([row[index] for row in batch])):
+            if english:
+                yield row
+
+
+def free_only(rows, index, free_price):
+    """Yield the rows whose price column `index` equals `free_price`."""
+    for row in rows:
+        if row[index] == free_price:
+            yield row
@@ -0,0 +1,120 @@
+"""Counting the individual genres of the semicolon-joined Genres column.
+
+Google Play lists several genres for some apps ('Education;Pretend Play'),
+so counting the Genres column as-is treats every combination as unrelated
+to its parts. GenreCounts splits the column, counts each genre once per
+app, and counts every pair of genres listed together, in a single pass.
+Genres get integer codes, per-genre counts are a list indexed by code and
+pairs are a sparse dictionary keyed by one integer per pair, so the
+counts stay compact even with thousands of genre combinations.
+"""
+
+from itertools import combinations
+
+
+class GenreCounts:
+    """Per-genre app counts and genre-pair co-occurrence counts.
+
+    Like FreqCounter, the counts can be updated with more rows and merged
+    with counts from other shards.
+    """
+
+    def __init__(self, index=9, separator=';'):
+        self.index = index
+        self.separator = separator
+        self.genres = []
+        self.total = 0
+        self.counts = []
+        # (code of first genre << 32 | code of second genre) -> count,
+        # with the smaller code first.
+        self.pairs = {}
+        self._codes = {}
+
+    def _code(self, genre):
+        code = self._codes.get(genre)
+        if code is None:
+            code = len(self.genres)
+            self._codes[genre] = code
+            self.genres.append(genre)
+            self.counts.append(0)
+        return code
+
+    def _add(self, codes, count=1):
+        self.total += count
+        for code in codes:
+            self.counts[code] += count
+        if len(codes) > 1:
+            pairs = self.pairs
+            for first, second in combinations(sorted(codes), 2):
+                pair = first << 32 | second
+                pairs[pair] = pairs.get(pair, 0) + count
+
+    def update(self, rows):
+        """Count the genres of `rows`; returns the counts."""
+        index = self.index
+        separator = self.separator
+        # Most rows repeat one of a few hundred Genres values, so each
+        # distinct value is split and coded only once.
+        split = {}
+
+        for row in rows:
+            value = row[index]
+            codes = split.get(value)
+            if codes is None:
+                codes = {self._code(genre.strip()) for genre in value.split(separator)
+                         if genre.strip()}
+                split[value] = codes
+            self._add(codes)
+        return self
+
+    def merge(self, other):
+        """Add the counts of `other`; returns the counts."""
+        remap = [self._code(genre) for genre in other.genres]
+        for code, count in enumerate(other.counts):
+            self.counts[remap[code]] += count
+        for pair, count in other.pairs.items():
+            first = remap[pair >> 32]
+            second = remap[pair & 0xFFFFFFFF]
+            if first > second:
+                first, second = second, first
+            key = first << 32 | second
+            self.pairs[key] = self.pairs.get(key, 0) + count
+        self.total += other.total
+        return self
+
+    def percentages(self):
+        """Return the share (in percent) of apps listing each genre.
+
+        An app can list several genres, so the shares can add up to more
+        than 100. `display_table` can print this.
+        """
+        table = {}
+        for code, genre in enumerate(self.genres):
+            table[genre] = (self.counts[code] / self.total) * 100
+        return table
+
+    def pair_counts(self):
+        """Return `{(genre, genre): number of apps listing both}`."""
+        genres = self.genres
+        return {(genres[pair >> 32], genres[pair & 0xFFFFFFFF]): count
+                for pair, count in self.pairs.items()}
+
+    def top_pairs(self, n=10):
+        """Return the `n` most frequent genre pairs as `((genre, genre), count)`."""
+        entries = sorted(self.pair_counts().items(), key=lambda item: (-item[1], item[0]))
+        return entries[:n]
+
+    def cooccurring(self, genre):
+        """Return `{other genre: number of apps listing both}` for `genre`."""
+        code = self._codes.get(genre)
+        if code is None:
+            return {}
+        result = {}
+        for pair, count in self.pairs.items():
+            first = pair >> 32
+            second = pair & 0xFFFFFFFF
+            if first == code:
+                result[self.genres[second]] = count
+            elif second == code:
+                result[self.genres[first]] = count
+        return result
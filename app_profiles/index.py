@@ -0,0 +1,78 @@
+"""Looking up the apps of one category/genre without scanning the data set."""
+
+from bisect import bisect_right
+
+from app_profiles import kernels
+from app_profiles.columnar import ColumnTable
+
+
+class GroupIndex:
+    """Row positions per value of a key column (Category, prime_genre, ...).
+
+    The index is built in one pass. With `sort_by`, the positions of every
+    group are ordered by that column, highest first (ties keep their
+    original order), so "the top apps of category X with at least Y
+    installs" is a lookup plus a slice.
+
+    `dataset` is a list of rows, with `key` and `sort_by` being column
+    indexes and `parse` turning the sort column into numbers (e.g.
+    `parse_installs`), or a ColumnTable, with column names (`parse` is then
+    ignored).
+    """
+
+    def __init__(self, dataset, key, sort_by=None, parse=float):
+        self.dataset = dataset
+        self.sort_by = sort_by
+        self.groups = {}
+        # Negated sort values per group, ascending, for threshold lookups.
+        self._negated = {}
+
+        if isinstance(dataset, ColumnTable):
+            keys = dataset[key]
+            values = dataset[sort_by] if sort_by is not None else None
+        else:
+            keys = (row[key] for row in dataset)
+            values = None
+            if sort_by is not None:
+                values = kernels.batch_parser(parse)([row[sort_by] for row in dataset])
+
+        for position, group in enumerate(keys):
+            if group in self.groups:
+                self.groups[group].append(position)
+            else:
+                self.groups[group] = [position]
+
+        if values is not None:
+            for group, positions in self.groups.items():
+                positions.sort(key=lambda position: -values[position])
+                self._negated[group] = [-values[position] for position in positions]
+
+    def positions(self, group, limit=None, at_least=None):
+        """Return the row positions of `group` (an empty list if unknown).
+
+        `at_least` keeps only rows whose `sort_by` value is at least that
+        much; `limit` keeps the first `limit` of them. Both need `sort_by`.
+        """
+        positions = self.groups.get(group, [])
+        if at_least is not None:
+            if self.sort_by is None:
+                raise ValueError('at_least needs an index built with sort_by')
+            positions = positions[:bisect_right(self._negated.get(group, []), -at_least)]
+        if limit is not None:
+            if self.sort_by is None:
+                raise ValueError('limit needs an index built with sort_by')
+            positions = positions[:limit]
+        return positions
+
+    def rows(self, group, limit=None, at_least=None):
+        """Return the rows of `group`; see `positions` for the options."""
+        positions = self.positions(group, limit, at_least)
+        if isinstance(self.dataset, ColumnTable):
+            return [self.dataset.row(position) for position in positions]
+        return [self.dataset[position] for position in positions]
+
+    def __contains__(self, group):
+        return group in self.groups
+
+    def __len__(self):
+        return len(self.groups)
@@ -0,0 +1,96 @@
+"""Reading many store snapshot files concurrently.
+
+Snapshots of both stores arrive every few hours, each as its own CSV file.
+`iter_snapshots` reads and cleans a batch of them with at most
+`max_in_flight` files in progress at once: the parsing and cleaning run in
+a thread pool while the event loop hands finished snapshots to the caller.
+Each result carries the snapshot's timestamp.
+"""
+
+import asyncio
+import os
+import re
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from app_profiles.pipeline import clean_store
+
+Snapshot = namedtuple('Snapshot', ['timestamp', 'path', 'header', 'rows'])
+
+_TIMESTAMP = re.compile(r'(\d{4})-?(\d{2})-?(\d{2})(?:[T_ ](\d{2})[-:]?(\d{2})(?:[-:]?(\d{2}))?)?')
+
+
+def snapshot_timestamp(path):
+    """Return the time a snapshot was taken, as a datetime.
+
+    A date (and optional time) in the file name is used if there is one,
+    e.g. 'googleplaystore_2018-09-03T06-00.csv'; otherwise the file's
+    modification time.
+    """
+    match = _TIMESTAMP.search(os.path.basename(path))
+    if match:
+        parts = [int(part) for part in match.groups() if part is not None]
+        try:
+            return datetime(*parts)
+        except ValueError:
+            pass  # digits that only look like a date
+    return datetime.fromtimestamp(os.path.getmtime(path))
+
+
+def _read_snapshot(path, store, timestamp):
+    header, rows = clean_store([path], store)
+    return Snapshot(timestamp(path), path, header, rows)
+
+
+async def iter_snapshots(paths, store, max_in_flight=8, timestamp=snapshot_timestamp,
+                         executor=None):
+    """Read and clean the snapshot files at `paths`, yielding Snapshot tuples.
+
+    At most `max_in_flight` files are being read at any time, and a new one
+    is only started once a finished snapshot has been handed over, so memory
+    stays bounded however many paths there are. Snapshots are yielded as
+    they finish, not in the order of `paths`; sort on `timestamp` if the
+    order matters. `store` is `pipeline.ANDROID` or `pipeline.IOS`.
+    """
+    loop = asyncio.get_running_loop()
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=max_in_flight)
+
+    pending = set()
+    paths = iter(paths)
+    try:
+        while True:
+            for path in paths:
+                pending.add(loop.run_in_executor(executor, _read_snapshot, path, store, timestamp))
+                if len(pending) >= max_in_flight:
+                    break
+            if not pending:
+                break
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if own_executor:
+            # Do not block the event loop on parses still running (e.g. when
+            # the consumer stopped early): queued ones are cancelled, running
+            # ones finish in their threads and their results are dropped.
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def read_snapshots(paths, store, max_in_flight=8, timestamp=snapshot_timestamp):
+    """Read all snapshots at `paths` and return them sorted by timestamp.
+
+    A blocking convenience wrapper around `iter_snapshots`.
+    """
+    async def collect():
+        return [snapshot async for snapshot in iter_snapshots(paths, store, max_in_flight,
+                                                               timestamp)]
+
+    snapshots = asyncio.run(collect())
+    snapshots.sort(key=lambda snapshot: (snapshot.timestamp, snapshot.path))
+    return snapshots
@@ -0,0 +1,46 @@
+"""Parsing the Google Play Installs column ('1,000,000+', '500+', ...).
+
+Installs are reported in about 20 buckets, so each distinct string is parsed
+once and the result cached. Besides its integer value, every bucket has an
+ordinal (its rank among `INSTALL_BUCKETS`), which turns questions like "at
+least 100,000,000+ installs" into integer comparisons instead of chains of
+string equality checks.
+"""
+
+from bisect import bisect_right
+from functools import lru_cache
+
+# The lower bounds of the Installs buckets used by Google Play, in order.
+INSTALL_BUCKETS = (
+    0, 1, 5, 10, 50, 100, 500,
+    1000, 5000, 10000, 50000, 100000, 500000,
+    1000000, 5000000, 10000000, 50000000, 100000000, 500000000,
+    1000000000,
+)
+
+
+@lru_cache(maxsize=1024)
+def parse_installs(installs):
+    """Return the number of installs in an Installs string as an integer."""
+    return int(installs.replace(',', '').replace('+', ''))
+
+
+@lru_cache(maxsize=1024)
+def installs_ordinal(installs):
+    """Return the rank of an Installs string (or number) among `INSTALL_BUCKETS`.
+
+    Values between two buckets get the ordinal of the lower one.
+    """
+    if isinstance(installs, str):
+        installs = parse_installs(installs)
+    return bisect_right(INSTALL_BUCKETS, installs) - 1
+
+
+def at_least(installs, threshold):
+    """Return True if the Installs string `installs` is at least `threshold`.
+
+    `threshold` is a bucket string such as '100,000,000+' or a number.
+    """
+    if isinstance(threshold, str):
+        threshold = parse_installs(threshold)
+    return parse_installs(installs) >= threshold
@@ -0,0 +1,90 @@
+"""Batch versions of the row-level hot loops, with an optional C fast path.
+
+After the algorithmic fixes, most of the remaining time goes to per-value
+Python work: the English-name check, the Installs string cleanup and
+parsing review counts with `float()`. The functions here take a whole
+column (a list of strings) at once. If the C extension
+`app_profiles._speedups` has been built (`python setup.py build_ext
+--inplace`), it is used; otherwise the pure-Python versions below run. Both
+give identical results; `ACCELERATED` tells which one is active.
+
+The English filter, deduplication, `ColumnTable.from_rows` and
+`group_aggregate` read their rows in batches of `BATCH_SIZE` (see
+`batches`) and hand each batch's column to these functions, so they use
+the C path whenever it is built.
+"""
+
+from itertools import islice
+
+from app_profiles.filters import english_mask as _python_english_mask
+from app_profiles.installs import parse_installs as _parse_one_installs
+
+try:
+    from app_profiles import _speedups
+except ImportError:
+    _speedups = None
+
+ACCELERATED = _speedups is not None
+
+# Rows per batch: large enough to amortize the call, small enough that a
+# streaming pipeline still holds only a few thousand rows at once.
+BATCH_SIZE = 4096
+
+
+def batches(rows, size=BATCH_SIZE):
+    """Yield `rows` (any iterable) as lists of at most `size` rows."""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def python_english_mask(names):
+    """Pure-Python `english_mask`."""
+    return _python_english_mask(names)
+
+
+def python_parse_installs(values):
+    """Pure-Python `parse_installs`."""
+    return [_parse_one_installs(value) for value in values]
+
+
+def python_parse_floats(values):
+    """Pure-Python `parse_floats`."""
+    return list(map(float, values))
+
+
+def english_mask(names):
+    """Return `is_english(name)` for each of `names`, as a list of booleans."""
+    if _speedups is not None:
+        return _speedups.english_mask(names)
+    return python_english_mask(names)
+
+
+def parse_installs(values):
+    """Return the Installs strings `values` ('1,000,000+', ...) as a list of integers."""
+    if _speedups is not None:
+        return _speedups.parse_installs(values, _parse_one_installs)
+    return python_parse_installs(values)
+
+
+def parse_floats(values):
+    """Return `float(value)` for each of `values` (e.g. the Reviews column)."""
+    if _speedups is not None:
+        return _speedups.parse_floats(values)
+    return python_parse_floats(values)
+
+
+def batch_parser(parse):
+    """Return a function parsing a list of values the way `parse` parses one.
+
+    `float` and `installs.parse_installs` map to `parse_floats` and
+    `parse_installs`; any other function is applied value by value.
+    """
+    if parse is float:
+        return parse_floats
+    if parse is _parse_one_installs:
+        return parse_installs
+    return lambda values: list(map(parse, values))
@@ -0,0 +1,35 @@
+"""Streaming access to the store CSV files."""
+
+from csv import reader, writer
+
+
+def read_header(path, encoding='utf8'):
+    """Return the header row of the CSV file at `path`."""
+    with open(path, encoding=encoding, newline='') as opened_file:
+        return next(reader(opened_file))
+
+
+def iter_rows(path, encoding='utf8'):
+    """Yield the data rows of the CSV file at `path` one at a time.
+
+    The header is skipped and the file is closed once the rows are exhausted
+    (or the generator is closed), so memory use stays flat however large the
+    file is.
+    """
+    with open(path, encoding=encoding, newline='') as opened_file:
+        read_file = reader(opened_file)
+        next(read_file, None)  # header
+        yield from read_file
+
+
+def open_dataset(path, encoding='utf8'):
+    """Return `(header, rows)` where `rows` is a lazy iterator over the data rows."""
+    return read_header(path, encoding), iter_rows(path, encoding)
+
+
+def write_rows(path, header, rows, encoding='utf8'):
+    """Write `header` and then `rows` to a CSV file at `path`."""
+    with open(path, 'w', encoding=encoding, newline='') as output_file:
+        write_file = writer(output_file)
+        write_file.writerow(header)
+        write_file.writerows(rows)
@@ -0,0 +1,101 @@
+"""Finding the apps that are listed in both stores.
+
+Names are normalized (case-folded, non-ASCII characters such as ™ or emoji
+dropped, as `is_english` counts them, and punctuation turned into spaces),
+then one store's names are put in a hash index and the other store is
+looked up in it, so matching takes linear time. Optionally, names without
+an exact match are compared with candidates found through an index of
+character trigrams, so this never turns into comparing every app with
+every other.
+"""
+
+import math
+import string
+
+_PUNCTUATION = str.maketrans(string.punctuation, ' ' * len(string.punctuation))
+
+
+def normalize_name(name):
+    """Return the form of an app name used for matching across stores."""
+    name = name.encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(name.casefold().translate(_PUNCTUATION).split())
+
+
+def trigrams(name):
+    """Return the set of character trigrams of a normalized name."""
+    padded = ' %s ' % name
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _exact_index(rows, index):
+    positions = {}
+    for position, row in enumerate(rows):
+        key = normalize_name(row[index])
+        if key:
+            positions.setdefault(key, []).append(position)
+    return positions
+
+
+def match_apps(android, ios, android_name=0, ios_name=1, fuzzy=False, threshold=0.8):
+    """Return the apps present in both data sets as `(android_row, ios_row, score)` tuples.
+
+    Exact matches on the normalized name have score 1.0. If a name is
+    listed several times in a store, every combination is returned. With
+    `fuzzy`, an Android app without an exact match is paired with the iOS
+    app whose name has the highest trigram Jaccard similarity, if that is
+    at least `threshold`.
+
+    Fuzzy candidates come from a trigram index of the iOS names, probed
+    with only the rarest trigrams of each Android name: a name sharing
+    fewer than `threshold * len(grams)` trigrams cannot reach the
+    threshold, so it is enough to probe with all but that many, rarest
+    first. This finds the same best match as comparing every pair would.
+    """
+    ios = list(ios)
+    ios_index = _exact_index(ios, ios_name)
+
+    matches = []
+    unmatched = []
+    for row in android:
+        key = normalize_name(row[android_name])
+        positions = ios_index.get(key)
+        if positions:
+            for position in positions:
+                matches.append((row, ios[position], 1.0))
+        elif fuzzy and key:
+            unmatched.append((row, key))
+
+    if unmatched:
+        ios_grams = [trigrams(normalize_name(row[ios_name])) for row in ios]
+        postings = {}
+        for position, grams in enumerate(ios_grams):
+            for gram in grams:
+                postings.setdefault(gram, []).append(position)
+
+        for row, key in unmatched:
+            grams = trigrams(key)
+            # Grams not in any iOS name can never be shared.
+            known = sorted((gram for gram in grams if gram in postings),
+                           key=lambda gram: len(postings[gram]))
+            needed = math.ceil(threshold * len(grams))
+            if len(known) < needed:
+                continue
+
+            candidates = set()
+            for gram in known[:len(known) - needed + 1]:
+                candidates.update(postings[gram])
+
+            best_score = 0
+            best_position = None
+            for position in sorted(candidates):
+                other = ios_grams[position]
+                shared = len(grams & other)
+                score = shared / (len(grams) + len(other) - shared)
+                if score > best_score:
+                    best_score = score
+                    best_position = position
+
+            if best_position is not None and best_score >= threshold:
+                matches.append((row, ios[best_position], best_score))
+
+    return matches
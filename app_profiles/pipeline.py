@@ -0,0 +1,157 @@
+"""The cleaning steps of the notebook as one pipeline over sharded CSV files.
+
+For each store the cleaning is: drop invalid rows, remove duplicate apps
+(keeping the row with the most reviews), keep English names, keep free apps.
+A store dump can be split into several CSV shards with the same header;
+`clean_store` processes them one after the other and `clean_store_parallel`
+fans them out to worker processes. Both go through the same per-shard and
+merge functions, so their results are identical.
+"""
+
+from functools import partial
+from operator import itemgetter
+
+from app_profiles import columns
+from app_profiles.duplicates import best_rows, merge_best_rows
+from app_profiles.filters import english_only, free_only
+from app_profiles.loading import iter_rows, read_header, write_rows
+from app_profiles.profiling import Profiler
+from app_profiles.validation import CHECKS, Quarantine, validate_rows
+
+# How to clean each store. `dedup_key` is None for the App Store, which the
+# notebook does not deduplicate; `checks` names the validation rules in
+# `app_profiles.validation.CHECKS`.
+ANDROID = {
+    'name': columns.ANDROID_NAME,
+    'price': columns.ANDROID_PRICE,
+    'free_price': columns.ANDROID_FREE_PRICE,
+    'dedup_key': columns.ANDROID_NAME,
+    'winner': columns.ANDROID_REVIEWS,
+    'checks': 'android',
+}
+IOS = {
+    'name': columns.IOS_NAME,
+    'price': columns.IOS_PRICE,
+    'free_price': columns.IOS_FREE_PRICE,
+    'dedup_key': None,
+    'winner': columns.IOS_RATING_COUNT,
+    'checks': 'ios',
+}
+STORES = {'android': ANDROID, 'ios': IOS}
+
+
+def clean_shard(path, store, profiler=None):
+    """Run the per-shard part of the cleaning on one CSV file.
+
+    English names only depend on the app name, so that filter runs before
+    deduplication. The free filter has to wait until the duplicates of all
+    shards are merged: duplicate rows of one app can have different prices,
+    and the notebook keeps the most-reviewed row before looking at the
+    price.
+
+    Returns `(result, quarantine)`: for stores without deduplication the
+    result is the cleaned rows, otherwise the shard's `best_rows`;
+    the Quarantine holds the rows that failed validation.
+
+    With an enabled Profiler, every step is recorded as a stage named
+    '<step> <path>' (load, validate, english_only, then dedup or
+    free_only). The rows are then held in a list between the steps, so
+    each one is timed on its own; without one they stream through.
+    """
+    profiler = profiler or Profiler(enabled=False)
+    quarantine = Quarantine(source=path)
+
+    with profiler.stage('load %s' % path) as record:
+        rows = iter_rows(path)
+        if profiler.enabled:
+            rows = list(rows)
+            record.rows_out = len(rows)
+    validate = profiler.profiled('validate %s' % path)(validate_rows)
+    rows = validate(rows, read_header(path), CHECKS[store['checks']], quarantine)
+    rows = profiler.profiled('english_only %s' % path)(english_only)(rows, store['name'])
+
+    if store['dedup_key'] is None:
+        keep_free = profiler.profiled('free_only %s' % path)(free_only)
+        shard_result = list(keep_free(rows, store['price'], store['free_price']))
+    else:
+        rows_in = len(rows) if profiler.enabled else None
+        with profiler.stage('dedup %s' % path, rows_in) as record:
+            shard_result = best_rows(rows, store['dedup_key'], store['winner'])
+            record.rows_out = len(shard_result)
+    return shard_result, quarantine
+
+
+def merge_shards(results, store, quarantine=None, profiler=None):
+    """Combine the `clean_shard` results (in shard order) into the final rows.
+
+    The shards' rejected rows are added to `quarantine` if one is given.
+    With a Profiler, the merge and the free filter are recorded as the
+    stages 'merge' and 'free_only'.
+    """
+    profiler = profiler or Profiler(enabled=False)
+    partials = []
+    for shard_result, shard_quarantine in results:
+        partials.append(shard_result)
+        if quarantine is not None:
+            quarantine.merge(shard_quarantine)
+
+    if store['dedup_key'] is None:
+        with profiler.stage('merge', sum(map(len, partials))) as record:
+            merged = []
+            for rows in partials:
+                merged.extend(rows)
+            record.rows_out = len(merged)
+        return merged
+
+    with profiler.stage('merge', sum(map(len, partials))) as record:
+        kept = sorted(merge_best_rows(partials).values(), key=itemgetter(1, 2))
+        rows = [entry[3] for entry in kept]
+        record.rows_out = len(rows)
+    keep_free = profiler.profiled('free_only')(free_only)
+    return list(keep_free(rows, store['price'], store['free_price']))
+
+
+def _check_headers(paths):
+    header = read_header(paths[0])
+    for path in paths[1:]:
+        if read_header(path) != header:
+            raise ValueError('%s has a different header than %s' % (path, paths[0]))
+    return header
+
+
+def clean_store(paths, store, quarantine=None, profiler=None):
+    """Clean the shards at `paths`, one after the other.
+
+    Returns `(header, rows)`. `store` is `ANDROID`, `IOS` or a dictionary
+    with the same keys. Rows failing validation are added to `quarantine`
+    if one is given. With a Profiler, every step of every shard and of the
+    merge is recorded as a stage; see `clean_shard` and `merge_shards`.
+    """
+    header = _check_headers(paths)
+    results = [clean_shard(path, store, profiler) for path in paths]
+    return header, merge_shards(results, store, quarantine, profiler)
+
+
+def clean_store_parallel(paths, store, max_workers=None, quarantine=None):
+    """Clean the shards at `paths` in a pool of worker processes.
+
+    Gives exactly the same result as `clean_store`: the shards' partial
+    results are collected in the order of `paths` and merged the same way.
+    """
+    # Imported here: it is slow to import and only parallel runs need it.
+    from concurrent.futures import ProcessPoolExecutor
+
+    header = _check_headers(paths)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(partial(clean_shard, store=store), paths))
+    return header, merge_shards(results, store, quarantine)
+
+
+def clean_to_csv(paths, store, output, parallel=True, max_workers=None, quarantine=None):
+    """Clean the shards at `paths` and write the result to `output`."""
+    if parallel:
+        header, rows = clean_store_parallel(paths, store, max_workers, quarantine)
+    else:
+        header, rows = clean_store(paths, store, quarantine)
+    write_rows(output, header, rows)
+    return len(rows)
@@ -0,0 +1,147 @@
+"""Timing and profiling of the pipeline stages.
+
+A Profiler records, for every stage run inside `profiler.stage(name)`, the
+wall time, the number of rows going in and out and, if enabled, the peak
+memory allocated (tracemalloc). One chosen stage can also be run under
+cProfile with its statistics written to a file. At the end of a run,
+`profiler.summary()` prints a table of all stages.
+
+    profiler = Profiler(trace_memory=True, cprofile_stage='dedup')
+    with profiler.stage('load') as stage:
+        android = list(iter_rows('googleplaystore.csv'))
+        stage.rows_out = len(android)
+    ...
+    profiler.summary()
+
+The `profiled` decorator does the same for a function taking and returning
+a list of rows.
+"""
+
+import cProfile
+import functools
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class StageRecord:
+    """The measurements of one stage run."""
+
+    def __init__(self, name, rows_in=None):
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.seconds = None
+        self.peak_bytes = None
+
+    def as_dict(self):
+        return {'stage': self.name, 'rows_in': self.rows_in, 'rows_out': self.rows_out,
+                'seconds': self.seconds, 'peak_bytes': self.peak_bytes}
+
+
+class Profiler:
+    """Collects a StageRecord for every stage of a run.
+
+    With `enabled=False` the stages still run but nothing is measured, so
+    the instrumentation can stay in place in production code.
+    `cprofile_stage` names a stage to run under cProfile, either by its full
+    name or by its first word, so 'dedup' matches 'dedup shard_1.csv' and
+    'dedup shard_2.csv'. The statistics of all matching stages are combined
+    in `cprofile_path` (default '<cprofile_stage>.prof', with spaces turned
+    into underscores), which `pstats` or snakeviz can read.
+    """
+
+    def __init__(self, enabled=True, trace_memory=False, cprofile_stage=None,
+                 cprofile_path=None):
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.cprofile_stage = cprofile_stage
+        self.cprofile_path = cprofile_path
+        self.records = []
+        self._profile = None
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        """Measure the code in the `with` block as the stage `name`.
+
+        Set `rows_out` (and `rows_in`, if not given here) on the yielded
+        StageRecord to have them in the summary.
+        """
+        record = StageRecord(name, rows_in)
+        if not self.enabled:
+            yield record
+            return
+
+        profile = None
+        if self.cprofile_stage is not None and self.cprofile_stage in (name, name.split()[0]):
+            if self._profile is None:
+                self._profile = cProfile.Profile()
+            profile = self._profile
+
+        # Only trace memory if nobody else (an outer stage) already is.
+        tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+
+        start = time.perf_counter()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield record
+        finally:
+            if profile is not None:
+                profile.disable()
+            record.seconds = time.perf_counter() - start
+            if tracing:
+                record.peak_bytes = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            if profile is not None:
+                profile.dump_stats(self.cprofile_path
+                                   or '%s.prof' % self.cprofile_stage.replace(' ', '_'))
+            self.records.append(record)
+
+    def profiled(self, name=None):
+        """Decorator: run a rows -> rows function as a stage, counting rows in and out.
+
+        Generators passed in or returned are turned into lists so they can
+        be counted.
+        """
+        def decorator(function):
+            stage_name = name or function.__name__
+
+            @functools.wraps(function)
+            def wrapper(rows, *args, **kwargs):
+                if not self.enabled:
+                    return function(rows, *args, **kwargs)
+                rows = rows if isinstance(rows, list) else list(rows)
+                with self.stage(stage_name, len(rows)) as record:
+                    result = function(rows, *args, **kwargs)
+                    result = result if isinstance(result, list) else list(result)
+                    record.rows_out = len(result)
+                return result
+            return wrapper
+        return decorator
+
+    def summary(self, show=True, output=None):
+        """Print a table of the recorded stages, or return them as dictionaries with `show=False`.
+
+        The table goes to `output` (a text file) if given, else to stdout.
+        """
+        if not show:
+            return [record.as_dict() for record in self.records]
+
+        width = max([20] + [len(record.name) for record in self.records])
+        print('%-*s %10s %10s %10s %12s' % (width, 'stage', 'rows in', 'rows out', 'seconds',
+                                            'peak KiB'), file=output)
+        total = 0
+        for record in self.records:
+            total += record.seconds
+            print('%-*s %10s %10s %10.4f %12s' % (
+                width,
+                record.name,
+                '' if record.rows_in is None else record.rows_in,
+                '' if record.rows_out is None else record.rows_out,
+                record.seconds,
+                '' if record.peak_bytes is None else record.peak_bytes // 1024,
+            ), file=output)
+        print('%-*s %10s %10s %10.4f' % (width, 'total', '', '', total), file=output)
@@ -0,0 +1,231 @@
+"""A small lazy query API: describe the steps, then run them in one pass.
+
+    from app_profiles.filters import is_english
+    from app_profiles.installs import parse_installs
+    from app_profiles.query import Dataset, col
+    from app_profiles.validation import ANDROID_CHECKS
+
+    (Dataset.scan('googleplaystore.csv')
+        .validate(ANDROID_CHECKS)
+        .dedup('App', winner='Reviews')
+        .filter(is_english, col='App')
+        .filter(col('Price') == '0')
+        .group_by('Category')
+        .mean('Installs', parse=parse_installs))
+
+Nothing is read until a terminal method (`collect`, `count`, `freq_table`,
+or an aggregate of `group_by`) is called. The steps are then chained as
+generators, so every row flows through all of them before the next is read
+and no intermediate list is built; the one exception is `dedup`, which has
+to see every row before it knows which one wins, and holds one row per app.
+`explain()` shows the plan. Columns can be given by name or index.
+"""
+
+import operator
+
+from app_profiles.aggregate import group_aggregate
+from app_profiles.duplicates import remove_duplicates
+from app_profiles.loading import iter_rows, read_header
+from app_profiles.tables import FreqCounter
+from app_profiles.validation import validate_rows
+
+
+def _index(header, column):
+    if isinstance(column, int):
+        return column
+    try:
+        return header.index(column)
+    except ValueError:
+        raise KeyError('no column %r in %r' % (column, header)) from None
+
+
+class Column:
+    """A column reference; comparing it builds a row predicate for `Dataset.filter`."""
+
+    def __init__(self, name, parse=None):
+        self.name = name
+        self.parse = parse
+
+    def _compare(self, function, symbol, other):
+        return Comparison(self, function, symbol, other)
+
+    def __eq__(self, other):
+        return self._compare(operator.eq, '==', other)
+
+    def __ne__(self, other):
+        return self._compare(operator.ne, '!=', other)
+
+    def __lt__(self, other):
+        return self._compare(operator.lt, '<', other)
+
+    def __le__(self, other):
+        return self._compare(operator.le, '<=', other)
+
+    def __gt__(self, other):
+        return self._compare(operator.gt, '>', other)
+
+    def __ge__(self, other):
+        return self._compare(operator.ge, '>=', other)
+
+    __hash__ = None
+
+
+def col(name, parse=None):
+    """Return a Column; `parse` converts its values before comparing (e.g. `float`)."""
+    return Column(name, parse)
+
+
+class Comparison:
+    """`column <op> value`, as built by comparing a Column."""
+
+    def __init__(self, column, function, symbol, value):
+        self.column = column
+        self.function = function
+        self.symbol = symbol
+        self.value = value
+
+    def bind(self, header):
+        """Return a function row -> bool for rows with this `header`."""
+        index = _index(header, self.column.name)
+        function = self.function
+        value = self.value
+        parse = self.column.parse
+        if parse is None:
+            return lambda row: function(row[index], value)
+        return lambda row: function(parse(row[index]), value)
+
+    def __repr__(self):
+        name = self.column.name
+        if self.column.parse is not None:
+            name = '%s(%s)' % (self.column.parse.__name__, name)
+        return '%s %s %r' % (name, self.symbol, self.value)
+
+
+class Dataset:
+    """A lazily evaluated sequence of steps over the rows of a CSV file (or any rows)."""
+
+    def __init__(self, header, source, description, steps=()):
+        self.header = list(header)
+        self._source = source
+        self._description = description
+        self._steps = steps
+
+    @classmethod
+    def scan(cls, path, encoding='utf8'):
+        """Start a plan reading the CSV file at `path` (only its header is read now)."""
+        return cls(read_header(path, encoding), lambda: iter_rows(path, encoding),
+                   'scan %s' % path)
+
+    @classmethod
+    def from_rows(cls, header, rows):
+        """Start a plan over rows already in memory (a list; it can be run repeatedly)."""
+        return cls(header, lambda: iter(rows), 'rows (%d)' % len(rows))
+
+    def _then(self, description, apply):
+        return Dataset(self.header, self._source, self._description,
+                       self._steps + ((description, apply),))
+
+    def validate(self, checks):
+        """Drop the rows failing `checks` (see `validation.validate_rows`)."""
+        header = self.header
+        return self._then('validate %s' % ', '.join(reason for _, reason, _ in checks),
+                          lambda rows: validate_rows(rows, header, checks))
+
+    def dedup(self, key, winner):
+        """Keep the row with the highest `winner` value per `key` (see `remove_duplicates`)."""
+        if isinstance(key, (tuple, list)):
+            key_index = tuple(_index(self.header, column) for column in key)
+        else:
+            key_index = _index(self.header, key)
+        winner_index = _index(self.header, winner)
+        return self._then('dedup key=%r winner=%r (holds one row per key)' % (key, winner),
+                          lambda rows: remove_duplicates(rows, key_index, winner_index))
+
+    def filter(self, predicate, col=None):
+        """Keep the rows for which `predicate` holds.
+
+        `predicate` is a comparison such as `col('Price') == '0'`, a
+        function of the whole row, or, with `col`, a function of that
+        column's value (e.g. `filter(is_english, col='App')`).
+        """
+        if isinstance(predicate, Comparison):
+            test = predicate.bind(self.header)
+            description = 'filter %r' % predicate
+        elif col is not None:
+            index = _index(self.header, col)
+            test = lambda row: predicate(row[index])
+            description = 'filter %s(%s)' % (getattr(predicate, '__name__', predicate), col)
+        else:
+            test = predicate
+            description = 'filter %s(row)' % getattr(predicate, '__name__', predicate)
+
+        def apply(rows):
+            for row in rows:
+                if test(row):
+                    yield row
+        return self._then(description, apply)
+
+    def __iter__(self):
+        rows = self._source()
+        for description, apply in self._steps:
+            rows = apply(rows)
+        return iter(rows)
+
+    def explain(self):
+        """Return the plan, one step per line."""
+        lines = [self._description]
+        for description, apply in self._steps:
+            lines.append('  -> ' + description)
+        return '\n'.join(lines)
+
+    def collect(self):
+        """Run the plan and return the rows as a list."""
+        return list(self)
+
+    def count(self):
+        """Run the plan and return the number of rows."""
+        n_rows = 0
+        for row in self:
+            n_rows += 1
+        return n_rows
+
+    def freq_table(self, column):
+        """Run the plan and return a FreqCounter of `column`."""
+        return FreqCounter(_index(self.header, column)).update(self)
+
+    def group_by(self, column):
+        """Group by `column`; call an aggregate on the result to run the plan."""
+        return GroupedDataset(self, column)
+
+
+class GroupedDataset:
+    """A Dataset grouped by a column, waiting for an aggregate."""
+
+    def __init__(self, dataset, key):
+        self.dataset = dataset
+        self.key = key
+
+    def explain(self):
+        return '%s\n  -> group_by %r' % (self.dataset.explain(), self.key)
+
+    def agg(self, value, aggs=('count', 'sum', 'mean'), parse=float, **options):
+        """Run the plan and return `group_aggregate` of `value` per group."""
+        header = self.dataset.header
+        return group_aggregate(self.dataset, _index(header, self.key), _index(header, value),
+                               aggs, parse, **options)
+
+    def _single(self, agg, value, parse):
+        results = self.agg(value, (agg,), parse)
+        return {group: result[agg] for group, result in results.items()}
+
+    def mean(self, value, parse=float):
+        return self._single('mean', value, parse)
+
+    def sum(self, value, parse=float):
+        return self._single('sum', value, parse)
+
+    def median(self, value, parse=float):
+        return self._single('median', value, parse)
+
+    def count(self):
+        return FreqCounter(_index(self.dataset.header, self.key)).update(self.dataset).counts
@@ -0,0 +1,274 @@
+"""Approximate, bounded-memory statistics for very large store archives.
+
+Exact frequency tables, distinct counts and medians need memory that grows
+with the data. The sketches here use a fixed amount of memory instead, and
+each can be merged with a sketch of the same kind built on another shard:
+
+* HyperLogLog counts distinct values (e.g. app names, for the duplicate
+  report). With `precision` p it uses 2**p bytes and its relative standard
+  error is 1.04 / sqrt(2**p): about 0.8% for the default p = 14.
+* SpaceSaving keeps the `k` most frequent values (e.g. genres). Each
+  estimated count is at least the true count and at most `total / k` above
+  it (the exact overestimate bound of each value is reported with it), and
+  every value more frequent than `total / k` is guaranteed to be kept.
+* TDigest estimates quantiles (medians, p90, p99 of reviews or installs).
+  It keeps about `compression` centroids, small ones near the tails, so
+  extreme quantiles are the most precise. Errors are in rank rather than
+  value: with the default compression of 100 the estimate of a quantile q
+  typically lies within 0.5 percentage points of rank of q (less at the
+  tails), with no hard guarantee.
+
+`tests/test_sketches.py` checks these bounds against the exact results;
+`benchmarks/sketches.py` compares their time and memory.
+"""
+
+import heapq
+import math
+from hashlib import blake2b
+
+
+def _hash64(value):
+    return int.from_bytes(blake2b(str(value).encode('utf8'), digest_size=8).digest(), 'big')
+
+
+class HyperLogLog:
+    """Approximate number of distinct values in a stream."""
+
+    def __init__(self, precision=14):
+        if not 4 <= precision <= 18:
+            raise ValueError('precision must be between 4 and 18')
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value):
+        hashed = _hash64(value)
+        bits = 64 - self.precision
+        register = hashed >> bits
+        # Position of the leftmost 1 in the remaining bits.
+        rank = bits - (hashed & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self.registers[register]:
+            self.registers[register] = rank
+
+    def update(self, values):
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other):
+        """Add the values seen by `other` (same precision); returns the sketch."""
+        if other.precision != self.precision:
+            raise ValueError('cannot merge sketches of different precision')
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def count(self):
+        """Return the estimated number of distinct values."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -rank for rank in self.registers)
+
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Few values: linear counting on the empty registers is more precise.
+            estimate = m * math.log(m / zeros)
+        return estimate
+
+
+class SpaceSaving:
+    """The `k` most frequent values of a stream, with bounded overestimates."""
+
+    def __init__(self, k=100):
+        self.k = k
+        self.total = 0
+        self.counts = {}
+        self.errors = {}
+        # (count, value) entries; an entry may be lower than the current
+        # count of its value, and is only corrected when it reaches the top.
+        self._heap = []
+
+    def add(self, value, count=1):
+        self.total += count
+        counts = self.counts
+
+        if value in counts:
+            counts[value] += count
+        elif len(counts) < self.k:
+            counts[value] = count
+            self.errors[value] = 0
+            heapq.heappush(self._heap, (count, value))
+        else:
+            smallest = self._pop_smallest()
+            counts[value] = smallest + count
+            self.errors[value] = smallest
+            heapq.heappush(self._heap, (smallest + count, value))
+
+    def _pop_smallest(self):
+        heap = self._heap
+        while True:
+            count, value = heap[0]
+            current = self.counts.get(value)
+            if current is None:
+                heapq.heappop(heap)
+            elif current != count:
+                heapq.heapreplace(heap, (current, value))
+            else:
+                heapq.heappop(heap)
+                del self.counts[value]
+                del self.errors[value]
+                return count
+
+    def update(self, values):
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other):
+        """Add the summary of another stream; returns the sketch.
+
+        A value missing from a full summary may still have occurred up to
+        that summary's smallest count times, so that is added to both its
+        count and its error. The overestimate stays below `total / k`.
+        """
+        def floor(sketch):
+            if len(sketch.counts) < sketch.k:
+                return 0
+            return min(sketch.counts.values())
+
+        own_floor = floor(self)
+        other_floor = floor(other)
+        merged = []
+        for value in set(self.counts) | set(other.counts):
+            count = self.counts.get(value, own_floor) + other.counts.get(value, other_floor)
+            error = self.errors.get(value, own_floor) + other.errors.get(value, other_floor)
+            merged.append((count, error, value))
+
+        kept = heapq.nlargest(self.k, merged, key=lambda entry: entry[0])
+        self.counts = {value: count for count, error, value in kept}
+        self.errors = {value: error for count, error, value in kept}
+        self._heap = [(count, value) for count, error, value in kept]
+        heapq.heapify(self._heap)
+        self.total += other.total
+        return self
+
+    def top(self, n=None):
+        """Return up to `n` `(value, estimated count, maximum overestimate)`, most frequent first."""
+        entries = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        return [(value, count, self.errors[value]) for value, count in entries[:n]]
+
+    def percentages(self, n=None):
+        """Return the estimated share (in percent) of the top values, like `freq_table`."""
+        table = {}
+        for value, count, error in self.top(n):
+            table[value] = (count / self.total) * 100
+        return table
+
+
+class TDigest:
+    """Approximate quantiles of a stream of numbers (a merging t-digest)."""
+
+    def __init__(self, compression=100):
+        self.compression = compression
+        self.means = []
+        self.weights = []
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer = []
+
+    def add(self, value, weight=1):
+        self._buffer.append((value, weight))
+        self.count += weight
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if len(self._buffer) >= 5 * self.compression:
+            self._compress()
+
+    def update(self, values):
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other):
+        """Add the values summarized by `other`; returns the digest."""
+        other._compress()
+        self._buffer.extend(zip(other.means, other.weights))
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _k(self, q):
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def _q_limit(self, q):
+        # The cumulative share up to which the current centroid may grow
+        # (one unit further on the k1 scale).
+        k = self._k(q) + 1
+        if k >= self.compression / 4:
+            return 1.0
+        return (math.sin(k * 2 * math.pi / self.compression) + 1) / 2
+
+    def _compress(self):
+        if not self._buffer:
+            return
+        points = sorted(list(zip(self.means, self.weights)) + self._buffer)
+        self._buffer = []
+
+        total = self.count
+        means = []
+        weights = []
+        before = 0
+        mean, weight = points[0]
+        limit = self._q_limit(0)
+        for point_mean, point_weight in points[1:]:
+            if (before + weight + point_weight) / total <= limit:
+                mean += (point_mean - mean) * point_weight / (weight + point_weight)
+                weight += point_weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                before += weight
+                limit = self._q_limit(before / total)
+                mean, weight = point_mean, point_weight
+        means.append(mean)
+        weights.append(weight)
+
+        self.means = means
+        self.weights = weights
+
+    def quantile(self, q):
+        """Return the estimated value below which a share `q` (0 to 1) of the data lies."""
+        if not 0 <= q <= 1:
+            raise ValueError('q must be between 0 and 1')
+        self._compress()
+        if not self.count:
+            raise ValueError('quantile of an empty digest')
+
+        means = self.means
+        weights = self.weights
+        if len(means) == 1:
+            return means[0]
+
+        index = q * self.count
+        if index <= weights[0] / 2:
+            if weights[0] == 1:
+                return self.min
+            return self.min + (means[0] - self.min) * index / (weights[0] / 2)
+
+        cumulative = weights[0] / 2
+        for i in range(len(means) - 1):
+            step = (weights[i] + weights[i + 1]) / 2
+            if cumulative + step > index:
+                return means[i] + (means[i + 1] - means[i]) * (index - cumulative) / step
+            cumulative += step
+
+        remaining = index - cumulative
+        if weights[-1] == 1:
+            return self.max
+        return means[-1] + (self.max - means[-1]) * min(1, remaining / (weights[-1] / 2))
+
+    def median(self):
+        return self.quantile(0.5)
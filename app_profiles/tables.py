@@ -0,0 +1,143 @@
+"""Frequency tables and printing helpers."""
+
+import heapq
+from itertools import islice
+
+from app_profiles.columnar import Categorical, ColumnTable
+
+
+def explore_data(dataset, start, end, rows_and_columns=False):
+    """Print rows `start` to `end` of `dataset`, optionally with its shape.
+
+    `dataset` may be a list (negative `start` and `end` work as in a
+    slice), any other iterable or a ColumnTable (including a
+    binstore.MappedTable); the row and column counts need a list or a table.
+    """
+    if isinstance(dataset, ColumnTable):
+        rows = islice(dataset.rows(), start, end)
+    elif hasattr(dataset, '__getitem__'):
+        rows = dataset[start:end]
+    else:
+        rows = islice(dataset, start, end)
+    for row in rows:
+        print(row)
+        print('\n')  # adds a new (empty) line after each row
+
+    if rows_and_columns:
+        print('Number of rows:', len(dataset))
+        if isinstance(dataset, ColumnTable):
+            print('Number of columns:', len(dataset.header))
+        else:
+            print('Number of columns:', len(dataset[0]))
+
+
+class FreqCounter:
+    """Raw value counts of one column, which can be updated and merged.
+
+    Unlike `freq_table`, which returns percentages only, the counter keeps
+    the count per value and the total number of rows, so new rows can be
+    added with `update` and counters built from different shards (or
+    different days) can be combined with `merge`. Percentages are computed
+    when asked for.
+    """
+
+    def __init__(self, index, counts=None, total=0):
+        self.index = index
+        self.counts = dict(counts or {})
+        self.total = total
+
+    def update(self, rows):
+        """Count column `index` of `rows`; returns the counter."""
+        counts = self.counts
+        index = self.index
+        total = 0
+
+        for row in rows:
+            total += 1
+            value = row[index]
+            if value in counts:
+                counts[value] += 1
+            else:
+                counts[value] = 1
+
+        self.total += total
+        return self
+
+    def merge(self, other):
+        """Add the counts of `other` (a counter of the same column); returns the counter."""
+        if other.index != self.index:
+            raise ValueError('cannot merge counters of columns %r and %r'
+                             % (self.index, other.index))
+
+        counts = self.counts
+        for value, count in other.counts.items():
+            if value in counts:
+                counts[value] += count
+            else:
+                counts[value] = count
+
+        self.total += other.total
+        return self
+
+    def percentages(self):
+        """Return the share (in percent) of each value, like `freq_table`."""
+        table_percentages = {}
+        for key in self.counts:
+            percentage = (self.counts[key] / self.total) * 100
+            table_percentages[key] = percentage
+
+        return table_percentages
+
+
+def freq_table(dataset, index):
+    """Return the share (in percent) of each value of column `index`.
+
+    `dataset` is consumed in a single pass, so a row generator works as well
+    as a list. It can also be a ColumnTable (or a binstore.MappedTable),
+    with `index` a column name; a dictionary-encoded column is then counted
+    from its codes without decoding any value.
+    """
+    if isinstance(dataset, ColumnTable):
+        column = dataset[index]
+        if isinstance(column, Categorical):
+            counts = {}
+            for value, count in column.value_counts().items():
+                if count:
+                    counts[value] = count
+            return FreqCounter(index, counts, len(column)).percentages()
+        return FreqCounter(0).update((value,) for value in column).percentages()
+    return FreqCounter(index).update(dataset).percentages()
+
+
+def display_table(dataset, index=None, limit=None, show=True):
+    """Print the frequency table of column `index`, most common value first.
+
+    `dataset` can also be a FreqCounter or a sketches.SpaceSaving (and
+    `index` left out), in which case the table is printed from its counts
+    without any rows.
+
+    With `limit`, only the `limit` most common values are kept; they are
+    picked with a heap instead of sorting the whole table, which matters for
+    high-cardinality columns such as Genres or app names. With `show=False`
+    nothing is printed and the entries are returned instead, as a list of
+    `(value, percentage)` tuples.
+    """
+    if hasattr(dataset, 'percentages'):
+        table = dataset.percentages()
+    else:
+        table = freq_table(dataset, index)
+    table_display = []
+    for key in table:
+        key_val_as_tuple = (table[key], key)
+        table_display.append(key_val_as_tuple)
+
+    if limit is None:
+        table_sorted = sorted(table_display, reverse=True)
+    else:
+        table_sorted = heapq.nlargest(limit, table_display)
+
+    if not show:
+        return [(entry[1], entry[0]) for entry in table_sorted]
+
+    for entry in table_sorted:
+        print(entry[1], ':', entry[0])
@@ -0,0 +1,216 @@
+"""Per-category aggregates of many snapshots, stored for trend reports.
+
+Instead of reprocessing every historical CSV file, each snapshot is reduced
+to a few numbers per category (number of apps, sum of installs, sum of
+ratings) and appended to an AggregateStore. Genre shares and average
+installs over any time range are then computed from the stored aggregates.
+
+A store is a directory with two append-only files:
+
+* `categories.jsonl`, one JSON string per line; a category's code is its
+  line number;
+* `aggregates.bin`, fixed-size little-endian records of (timestamp in
+  seconds, category code, count, sum of installs, sum of ratings).
+
+Snapshots must be appended in time order, one per timestamp (a rerun of
+the last one can replace it), which keeps the records sorted by timestamp
+so a range query is a binary search over the memory-mapped records. A
+record or category line cut short by a crash during an append is ignored,
+and dropped by the next append.
+"""
+
+import json
+import mmap
+import os
+import struct
+from datetime import datetime, timedelta
+
+RECORD = struct.Struct('<qiqdd')
+EPOCH = datetime(1970, 1, 1)
+
+
+def _seconds(timestamp):
+    return int((timestamp - EPOCH).total_seconds())
+
+
+def snapshot_aggregates(rows, key, installs=None, ratings=None, parse_installs=float,
+                        parse_ratings=float):
+    """Reduce one snapshot to `{category: (count, sum of installs, sum of ratings)}`.
+
+    `key`, `installs` and `ratings` are column indexes; a sum whose column
+    is None is 0 (the App Store has no installs column, for instance).
+    """
+    aggregates = {}
+    for row in rows:
+        category = row[key]
+        n_installs = parse_installs(row[installs]) if installs is not None else 0
+        n_ratings = parse_ratings(row[ratings]) if ratings is not None else 0
+        if category in aggregates:
+            count, total_installs, total_ratings = aggregates[category]
+            aggregates[category] = (count + 1, total_installs + n_installs,
+                                    total_ratings + n_ratings)
+        else:
+            aggregates[category] = (1, n_installs, n_ratings)
+    return aggregates
+
+
+class AggregateStore:
+    """An append-only store of per-category aggregates, one batch per snapshot.
+
+    Timestamps are naive datetimes (as given by `ingest.snapshot_timestamp`)
+    and are stored with one-second resolution.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._categories_path = os.path.join(directory, 'categories.jsonl')
+        self._records_path = os.path.join(directory, 'aggregates.bin')
+
+        self.categories = []
+        self._codes = {}
+        if os.path.exists(self._categories_path):
+            with open(self._categories_path, encoding='utf8') as categories_file:
+                for line in categories_file:
+                    if line.endswith('\n'):
+                        self._add_category(json.loads(line))
+
+    def _add_category(self, category):
+        self._codes[category] = len(self.categories)
+        self.categories.append(category)
+
+    def _records(self):
+        """Return the records file mapped into memory and its number of records."""
+        if not os.path.exists(self._records_path) or not os.path.getsize(self._records_path):
+            return None, 0
+        with open(self._records_path, 'rb') as records_file:
+            mapped = mmap.mmap(records_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return mapped, len(mapped) // RECORD.size
+
+    def _timestamp_at(self, mapped, position):
+        return RECORD.unpack_from(mapped, position * RECORD.size)[0]
+
+    def _bisect(self, mapped, n_records, seconds):
+        # First record with a timestamp >= seconds.
+        low, high = 0, n_records
+        while low < high:
+            middle = (low + high) // 2
+            if self._timestamp_at(mapped, middle) < seconds:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def last_timestamp(self):
+        mapped, n_records = self._records()
+        if not n_records:
+            return None
+        try:
+            return EPOCH + timedelta(seconds=self._timestamp_at(mapped, n_records - 1))
+        finally:
+            mapped.close()
+
+    def append(self, timestamp, aggregates, replace=False):
+        """Add the aggregates (see `snapshot_aggregates`) of the snapshot taken at `timestamp`.
+
+        `timestamp` must be later than the last stored snapshot: a second
+        batch at the same second would be counted twice by `trend`. With
+        `replace=True`, a batch at the last stored timestamp (e.g. a rerun
+        of that snapshot) replaces it instead.
+        """
+        seconds = _seconds(timestamp)
+        last = self.last_timestamp()
+        if last is not None and timestamp < last:
+            raise ValueError('snapshot at %s is older than the last one stored (%s)'
+                             % (timestamp, last))
+        if last is not None and seconds == _seconds(last):
+            if not replace:
+                raise ValueError('a snapshot at %s is already stored; pass replace=True '
+                                 'to replace it' % last)
+            self._drop_from(seconds)
+
+        new_categories = [category for category in aggregates if category not in self._codes]
+        if new_categories:
+            # Written before the records that refer to them.
+            with open(self._categories_path, 'a+b') as categories_file:
+                # Drop a partial line left by an interrupted append; it was
+                # skipped when opening, so the codes stay the same.
+                categories_file.seek(0)
+                complete = categories_file.read().rfind(b'\n') + 1
+                categories_file.truncate(complete)
+                for category in new_categories:
+                    categories_file.write((json.dumps(category) + '\n').encode('utf8'))
+            for category in new_categories:
+                self._add_category(category)
+
+        records = b''.join(RECORD.pack(seconds, self._codes[category], count,
+                                       total_installs, total_ratings)
+                           for category, (count, total_installs, total_ratings)
+                           in aggregates.items())
+
+        with open(self._records_path, 'ab') as records_file:
+            # Drop a partial record left by an interrupted append.
+            size = records_file.tell()
+            if size % RECORD.size:
+                records_file.truncate(size - size % RECORD.size)
+            records_file.write(records)
+
+    def _drop_from(self, seconds):
+        """Remove the records with a timestamp of `seconds` or later."""
+        mapped, n_records = self._records()
+        try:
+            first = self._bisect(mapped, n_records, seconds)
+        finally:
+            mapped.close()
+        with open(self._records_path, 'r+b') as records_file:
+            records_file.truncate(first * RECORD.size)
+
+    def query(self, start=None, end=None, categories=None):
+        """Return the records with `start <= timestamp < end`, optionally for some categories.
+
+        Each record is `(timestamp, category, count, sum of installs, sum of
+        ratings)`, in the order they were appended.
+        """
+        mapped, n_records = self._records()
+        if not n_records:
+            return []
+
+        try:
+            first = self._bisect(mapped, n_records, _seconds(start)) if start else 0
+            last = self._bisect(mapped, n_records, _seconds(end)) if end else n_records
+            wanted = None
+            if categories is not None:
+                wanted = {self._codes[category] for category in categories
+                          if category in self._codes}
+
+            results = []
+            for position in range(first, last):
+                seconds, code, count, total_installs, total_ratings = RECORD.unpack_from(
+                    mapped, position * RECORD.size)
+                if wanted is None or code in wanted:
+                    results.append((EPOCH + timedelta(seconds=seconds), self.categories[code],
+                                    count, total_installs, total_ratings))
+            return results
+        finally:
+            mapped.close()
+
+    def trend(self, start=None, end=None, categories=None):
+        """Return `{timestamp: {category: stats}}` for the snapshots in the range.
+
+        The stats of a category are its 'share' of the snapshot's apps (in
+        percent, like `freq_table`), 'average_installs' and
+        'average_ratings'.
+        """
+        totals = {}
+        for timestamp, category, count, total_installs, total_ratings in self.query(start, end):
+            totals[timestamp] = totals.get(timestamp, 0) + count
+
+        report = {}
+        for timestamp, category, count, total_installs, total_ratings in self.query(
+                start, end, categories):
+            report.setdefault(timestamp, {})[category] = {
+                'share': (count / totals[timestamp]) * 100,
+                'average_installs': total_installs / count,
+                'average_ratings': total_ratings / count,
+            }
+        return report
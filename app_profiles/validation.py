@@ -0,0 +1,131 @@
+"""Checking every row before cleaning, instead of deleting known bad rows by index.
+
+Each row is checked in a single pass for the right number of fields and for
+values that later stages parse (ratings within 0-5, numeric review counts
+and prices). Rows that fail go to a Quarantine with the reasons, so bad rows
+can be found wherever they are in a file, and rerunning the check is
+harmless.
+"""
+
+from csv import writer
+
+from app_profiles.columnar import parse_price
+
+
+def _number_check(parse):
+    def check(value):
+        try:
+            parse(value)
+        except ValueError:
+            return False
+        return True
+    return check
+
+
+def _rating_check(value):
+    try:
+        rating = float(value)
+    except ValueError:
+        return False
+    # Apps without ratings have 'NaN', which is not an error.
+    return rating != rating or 0 <= rating <= 5
+
+
+def _count_check(value):
+    # isdigit() alone accepts characters such as '²' that float() rejects.
+    return value.isascii() and value.isdigit()
+
+
+# (column name, reason reported on failure, check) for each store.
+ANDROID_CHECKS = (
+    ('Rating', 'Rating outside 0-5', _rating_check),
+    ('Reviews', 'non-numeric Reviews', _count_check),
+    ('Price', 'non-numeric Price', _number_check(parse_price)),
+)
+IOS_CHECKS = (
+    ('user_rating', 'user_rating outside 0-5', _rating_check),
+    ('rating_count_tot', 'non-numeric rating_count_tot', _count_check),
+    ('price', 'non-numeric price', _number_check(parse_price)),
+)
+CHECKS = {'android': ANDROID_CHECKS, 'ios': IOS_CHECKS}
+
+
+def table_checks(numeric, checks=()):
+    """Return `checks` plus a check for every other column of `numeric`.
+
+    `numeric` maps column names to their parsers, as for
+    `ColumnTable.from_rows`; a row passing the returned checks can be
+    parsed into a table.
+    """
+    checked = {name for name, reason, check in checks}
+    extra = tuple((name, 'non-numeric %s' % name, _number_check(parse))
+                  for name, parse in numeric.items() if name not in checked)
+    return tuple(checks) + extra
+
+WRONG_COLUMN_COUNT = 'wrong number of columns'
+
+
+class Quarantine:
+    """The rejected rows of a validation run, with their reasons and counts."""
+
+    def __init__(self, source=None):
+        # Where the rows come from (e.g. a shard's path), written out with them.
+        self.source = source
+        self.rejects = []
+        self.counts = {}
+
+    def add(self, position, row, reasons, source=None):
+        if source is None:
+            source = self.source
+        self.rejects.append((source, position, row, reasons))
+        for reason in reasons:
+            if reason in self.counts:
+                self.counts[reason] += 1
+            else:
+                self.counts[reason] = 1
+
+    def merge(self, other):
+        """Add the rejects of `other`, keeping their sources; returns the quarantine."""
+        for source, position, row, reasons in other.rejects:
+            self.add(position, row, reasons, source)
+        return self
+
+    def write(self, path, encoding='utf8'):
+        """Write the rejects to a CSV file.
+
+        Each line has the source, the position, the reasons (joined with
+        ';') and then the rejected row's fields.
+        """
+        with open(path, 'w', encoding=encoding, newline='') as output_file:
+            write_file = writer(output_file)
+            write_file.writerow(['source', 'position', 'reasons'])
+            for source, position, row, reasons in self.rejects:
+                write_file.writerow([source, position, ';'.join(reasons)] + row)
+
+    def __len__(self):
+        return len(self.rejects)
+
+
+def validate_rows(rows, header, checks, quarantine=None):
+    """Yield the rows of `rows` that pass `checks`; send the others to `quarantine`.
+
+    `checks` is a sequence of `(column name, reason, check)` such as
+    `ANDROID_CHECKS`; the names are looked up in `header`. A row with the
+    wrong number of fields is rejected without running the other checks,
+    since its values are in the wrong columns. Positions count data rows
+    from 0, as in the notebook's `android` list. Without a `quarantine`,
+    rejected rows are dropped.
+    """
+    n_columns = len(header)
+    resolved = [(header.index(name), reason, check) for name, reason, check in checks]
+
+    for position, row in enumerate(rows):
+        if len(row) != n_columns:
+            reasons = [WRONG_COLUMN_COUNT]
+        else:
+            reasons = [reason for index, reason, check in resolved if not check(row[index])]
+
+        if not reasons:
+            yield row
+        elif quarantine is not None:
+            quarantine.add(position, row, reasons)
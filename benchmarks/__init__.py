@@ -0,0 +1,6 @@
+"""Timing scripts for the analysis stages.
+
+Run a benchmark from the repository root, e.g. `python -m benchmarks.duplicates`.
+`python -m benchmarks.stages` times the whole pipeline stage by stage on
+synthetic data and prints machine-readable results.
+"""
@@ -0,0 +1,58 @@
+"""Opening a store from CSV against opening its binary table file.
+
+Converts the CSV files given on the command line (googleplaystore.csv and
+AppleStore.csv by default) to table files in a temporary directory, then
+times loading each format and reading one column. The round trip itself is
+checked in tests/test_binstore.py.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from app_profiles.binstore import convert_csv, open_table
+from app_profiles.columnar import (ANDROID_CATEGORICAL, ANDROID_NUMERIC, ColumnTable,
+                                   IOS_CATEGORICAL, IOS_NUMERIC)
+from app_profiles.loading import iter_rows, read_header
+from app_profiles.validation import ANDROID_CHECKS, IOS_CHECKS, table_checks, validate_rows
+
+SCHEMAS = {
+    'googleplaystore.csv': (ANDROID_NUMERIC, ANDROID_CATEGORICAL, ANDROID_CHECKS, 'Reviews'),
+    'AppleStore.csv': (IOS_NUMERIC, IOS_CATEGORICAL, IOS_CHECKS, 'rating_count_tot'),
+}
+
+
+def load_csv(path, numeric, categorical, checks):
+    header = read_header(path)
+    rows = validate_rows(iter_rows(path), header, table_checks(numeric, checks))
+    return ColumnTable.from_rows(header, rows, numeric, categorical)
+
+
+def main(paths=('googleplaystore.csv', 'AppleStore.csv')):
+    with tempfile.TemporaryDirectory() as directory:
+        for path in paths:
+            time_store(path, directory)
+
+
+def time_store(path, directory):
+    numeric, categorical, checks, column = SCHEMAS[os.path.basename(path)]
+    table_path = os.path.join(directory, os.path.basename(path) + '.table')
+    convert_csv(path, table_path, numeric, categorical, checks)
+
+    start = time.perf_counter()
+    from_csv = load_csv(path, numeric, categorical, checks)
+    csv_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with open_table(table_path) as mapped:
+        open_time = time.perf_counter() - start
+        sum(mapped[column])
+        column_time = time.perf_counter() - start
+
+    print('%-20s %7d rows  csv: %7.4fs  table open: %7.5fs  open + sum(%s): %7.5fs'
+          % (os.path.basename(path), len(from_csv), csv_time, open_time, column, column_time))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:] or ('googleplaystore.csv', 'AppleStore.csv'))
@@ -0,0 +1,50 @@
+"""Duplicate scan: list membership (as in the notebook) against `duplicate_report`.
+
+Only times the two; tests/test_duplicates.py checks they agree.
+"""
+
+import random
+import sys
+import time
+
+from app_profiles.duplicates import duplicate_report
+
+
+def list_duplicates(dataset):
+    # The notebook's version: `in` on a list makes it quadratic.
+    duplicate_apps = []
+    unique_apps = []
+
+    for app in dataset:
+        name = app[0]
+        if name in unique_apps:
+            duplicate_apps.append(name)
+        else:
+            unique_apps.append(name)
+
+    return duplicate_apps
+
+
+def make_rows(n_rows, duplicate_share=0.1, seed=0):
+    rng = random.Random(seed)
+    n_names = max(1, int(n_rows * (1 - duplicate_share)))
+    return [['App %d' % rng.randrange(n_names)] for _ in range(n_rows)]
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main(sizes=(1000, 5000, 20000)):
+    for n_rows in sizes:
+        rows = make_rows(n_rows)
+        list_time = timed(list_duplicates, rows)[1]
+        dict_time = timed(duplicate_report, rows)[1]
+        print('%8d rows  list: %8.3fs  dict: %8.4fs  speed-up: %6.0fx'
+              % (n_rows, list_time, dict_time, list_time / dict_time))
+
+
+if __name__ == '__main__':
+    main([int(size) for size in sys.argv[1:]] or (1000, 5000, 20000))
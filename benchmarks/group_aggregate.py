@@ -0,0 +1,54 @@
+"""Per-category averages: the notebook's nested loops against `group_aggregate`.
+
+Only times the two; tests/test_aggregate.py checks they agree.
+"""
+
+import random
+import sys
+import time
+
+from app_profiles.aggregate import group_aggregate
+from app_profiles.tables import freq_table
+
+
+def nested_loop_means(dataset, key, value):
+    # The notebook's version: one full scan of the data set per category.
+    means = {}
+    for category in freq_table(dataset, key):
+        total = 0
+        len_category = 0
+        for app in dataset:
+            if app[key] == category:
+                total += float(app[value])
+                len_category += 1
+        means[category] = total / len_category
+    return means
+
+
+def make_rows(n_rows, n_categories, seed=0):
+    rng = random.Random(seed)
+    return [['CATEGORY_%d' % rng.randrange(n_categories), str(rng.randrange(10 ** 6))]
+            for _ in range(n_rows)]
+
+
+def main(n_rows=20000, category_counts=(10, 100, 500)):
+    for n_categories in category_counts:
+        rows = make_rows(n_rows, n_categories)
+
+        start = time.perf_counter()
+        nested_loop_means(rows, 0, 1)
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        group_aggregate(rows, 0, 1, aggs=('mean',))
+        group_time = time.perf_counter() - start
+
+        print('%8d rows %4d categories  nested loops: %7.3fs  group_aggregate: %7.4fs'
+              % (n_rows, n_categories, loop_time, group_time))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main(int(sys.argv[1]), [int(count) for count in sys.argv[2:]] or (10, 100, 500))
+    else:
+        main()
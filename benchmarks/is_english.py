@@ -0,0 +1,52 @@
+"""English filter: per-character `is_english` against the batched `english_mask`."""
+
+import random
+import sys
+import time
+
+from app_profiles.filters import english_mask, is_english
+
+SAMPLE_NAMES = [
+    'Instagram',
+    '爱奇艺PPS -《欢乐颂2》电视剧热播',
+    'Docs To Go™ Free Office Suite',
+    'Instachat 😜',
+    'Ab😜😜😜',
+    'Ab😜😜😜😜',
+    'Café — Crème ✓',
+    '',
+]
+
+
+def make_names(n_names, seed=0):
+    rng = random.Random(seed)
+    words = ['Photo', 'Editor', 'Free', 'Pro', 'Chat', 'Map', 'Go', 'HD']
+    extras = ['', '', '', '', '™', ' 😜', ' ✓✓', ' 欢乐颂2', '电视剧热播']
+    names = []
+    for _ in range(n_names):
+        name = ' '.join(rng.choice(words) for _ in range(rng.randint(1, 5)))
+        names.append(name + rng.choice(extras))
+    return names
+
+
+def main(sizes=(10000, 100000, 1000000)):
+    assert english_mask(SAMPLE_NAMES) == [is_english(name) for name in SAMPLE_NAMES]
+
+    for n_names in sizes:
+        names = make_names(n_names)
+
+        start = time.perf_counter()
+        expected = [is_english(name) for name in names]
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        mask = english_mask(names)
+        mask_time = time.perf_counter() - start
+
+        assert mask == expected
+        print('%8d names  is_english: %7.3fs  english_mask: %7.3fs  speed-up: %5.1fx'
+              % (n_names, loop_time, mask_time, loop_time / mask_time))
+
+
+if __name__ == '__main__':
+    main([int(size) for size in sys.argv[1:]] or (10000, 100000, 1000000))
@@ -0,0 +1,54 @@
+"""Row kernels: the C extension against the pure-Python fallback.
+
+Times both paths on the cleaned store files and on synthetic columns. Build
+the extension first with `python setup.py build_ext --inplace`; without it
+only the pure-Python times are reported. That both paths give identical
+results is checked in tests/test_kernels.py.
+"""
+
+import sys
+import time
+
+from app_profiles import kernels
+from app_profiles.loading import iter_rows, read_header
+from app_profiles.validation import ANDROID_CHECKS, IOS_CHECKS, validate_rows
+from benchmarks.synthetic import android_rows
+
+
+def timed(function, values):
+    start = time.perf_counter()
+    function(values)
+    return time.perf_counter() - start
+
+
+def report(label, function_name, values):
+    python_time = timed(getattr(kernels, 'python_' + function_name), values)
+    if not kernels.ACCELERATED:
+        print('%-10s %-15s %8d values  python: %7.3fs'
+              % (label, function_name, len(values), python_time))
+        return
+    fast_time = timed(getattr(kernels, function_name), values)
+    print('%-10s %-15s %8d values  python: %7.3fs  C: %7.3fs  speed-up: %5.1fx'
+          % (label, function_name, len(values), python_time, fast_time, python_time / fast_time))
+
+
+def main(n_rows=1000000):
+    if not kernels.ACCELERATED:
+        print('C extension not built; only the pure-Python path is timed.')
+
+    android = list(validate_rows(iter_rows('googleplaystore.csv'),
+                                 read_header('googleplaystore.csv'), ANDROID_CHECKS))
+    ios = list(validate_rows(iter_rows('AppleStore.csv'), read_header('AppleStore.csv'),
+                             IOS_CHECKS))
+    report('stores', 'english_mask', [row[0] for row in android] + [row[1] for row in ios])
+    report('stores', 'parse_installs', [row[5] for row in android])
+    report('stores', 'parse_floats', [row[3] for row in android] + [row[5] for row in ios])
+
+    rows = list(android_rows(n_rows))
+    report('synthetic', 'english_mask', [row[0] for row in rows])
+    report('synthetic', 'parse_installs', [row[5] for row in rows])
+    report('synthetic', 'parse_floats', [row[3] for row in rows])
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,93 @@
+"""Approximate sketches against the exact computations.
+
+Builds each sketch over several shards of synthetic data and merges them,
+and reports the error against the exact result and the time and peak
+memory of both paths. The error bounds documented in
+`app_profiles.sketches` are checked in tests/test_sketches.py.
+"""
+
+import bisect
+import sys
+import time
+import tracemalloc
+
+from app_profiles.duplicates import duplicate_report
+from app_profiles.sketches import HyperLogLog, SpaceSaving, TDigest
+from app_profiles.tables import FreqCounter
+from benchmarks.synthetic import android_rows
+
+N_SHARDS = 4
+
+
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = function()
+        return result, time.perf_counter() - start, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def sharded(sketch_class, rows, add, **options):
+    sketches = [sketch_class(**options) for _ in range(N_SHARDS)]
+    for position, row in enumerate(rows):
+        add(sketches[position % N_SHARDS], row)
+    merged = sketches[0]
+    for sketch in sketches[1:]:
+        merged.merge(sketch)
+    return merged
+
+
+def check_distinct(rows, precision=14):
+    exact, exact_time, exact_memory = measure(lambda: duplicate_report(rows))
+    n_distinct = len(rows) - exact['n_duplicates']
+    sketch, sketch_time, sketch_memory = measure(
+        lambda: sharded(HyperLogLog, rows, lambda sketch, row: sketch.add(row[0]),
+                        precision=precision))
+    error = abs(sketch.count() - n_distinct) / n_distinct
+    return 'distinct names', error, exact_time, exact_memory, sketch_time, sketch_memory
+
+
+def check_top_values(rows, k=20):
+    exact, exact_time, exact_memory = measure(lambda: FreqCounter(1).update(rows))
+    sketch, sketch_time, sketch_memory = measure(
+        lambda: sharded(SpaceSaving, rows, lambda sketch, row: sketch.add(row[1]), k=k))
+
+    worst = 0
+    for value, count, error in sketch.top():
+        worst = max(worst, (count - exact.counts[value]) / sketch.total)
+    return 'top categories', worst, exact_time, exact_memory, sketch_time, sketch_memory
+
+
+def check_quantiles(rows, quantiles=(0.5, 0.9, 0.99)):
+    def exact_path():
+        return sorted(float(row[3]) for row in rows)
+
+    def sketch_path():
+        return sharded(TDigest, rows, lambda sketch, row: sketch.add(float(row[3])))
+
+    values, exact_time, exact_memory = measure(exact_path)
+    digest, sketch_time, sketch_memory = measure(sketch_path)
+
+    worst = 0
+    for q in quantiles:
+        estimate = digest.quantile(q)
+        # With ties, any rank between these two is right for the estimate.
+        low = bisect.bisect_left(values, estimate) / len(values)
+        high = bisect.bisect_right(values, estimate) / len(values)
+        worst = max(worst, low - q, q - high)
+    return 'review quantiles', worst, exact_time, exact_memory, sketch_time, sketch_memory
+
+
+def main(sizes=(10000, 100000)):
+    for n_rows in sizes:
+        rows = list(android_rows(n_rows))
+        for check in (check_distinct, check_top_values, check_quantiles):
+            name, error, exact_time, exact_memory, sketch_time, sketch_memory = check(rows)
+            print('%8d rows  %-16s error: %.4f  exact: %6.3fs %9d B  sketch: %6.3fs %9d B'
+                  % (n_rows, name, error, exact_time, exact_memory, sketch_time, sketch_memory))
+
+
+if __name__ == '__main__':
+    main([int(size) for size in sys.argv[1:]] or (10000, 100000))
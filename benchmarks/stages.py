@@ -0,0 +1,154 @@
+"""Time every cleaning and analysis stage on synthetic data of growing size.
+
+Usage (from the repository root):
+
+    python -m benchmarks.stages [--sizes 10000 100000 ...] [--output results.jsonl]
+                                [--no-memory] [--data-dir DIR]
+
+For each size, synthetic Google Play and App Store files are generated (or
+reused from `--data-dir`), then each stage is run on its own. Every
+measurement is one JSON object per line with the store, stage, number of
+input rows, seconds, rows per second and, unless `--no-memory`, the peak
+memory allocated by the stage (measured with tracemalloc in a second,
+untimed run, since tracing slows the stage down). Compare the output of two
+runs to catch regressions.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from app_profiles.aggregate import group_aggregate
+from app_profiles.duplicates import duplicate_report, remove_duplicates
+from app_profiles.filters import english_only, free_only
+from app_profiles.installs import parse_installs
+from app_profiles.loading import iter_rows, read_header
+from app_profiles.tables import display_table, freq_table
+from app_profiles.validation import ANDROID_CHECKS, IOS_CHECKS, validate_rows
+from benchmarks.synthetic import write_android, write_ios
+
+DEFAULT_SIZES = (10000, 100000, 1000000, 10000000)
+
+
+def analysis(function):
+    """Wrap a stage whose result is a report, so the next stage gets the same rows."""
+    def stage(rows):
+        function(rows)
+        return rows
+    return stage
+
+
+def android_stages(path):
+    """Return the (name, function) stages for a Google Play file, in order.
+
+    Each stage takes the previous stage's output; the analysis stages all
+    take the cleaned rows.
+    """
+    header = read_header(path)
+    return [
+        ('load', lambda _: list(iter_rows(path))),
+        ('validate', lambda rows: list(validate_rows(rows, header, ANDROID_CHECKS))),
+        ('duplicate_scan', analysis(lambda rows: duplicate_report(rows))),
+        ('dedup', lambda rows: remove_duplicates(rows)),
+        ('is_english', lambda rows: list(english_only(rows, 0))),
+        ('free_filter', lambda rows: list(free_only(rows, 7, '0'))),
+        ('freq_table', analysis(lambda rows: freq_table(rows, 1))),
+        ('display_table', analysis(lambda rows: display_table(rows, 1, show=False))),
+        ('category_averages',
+         analysis(lambda rows: group_aggregate(rows, 1, 5, ('mean',), parse_installs))),
+    ]
+
+
+def ios_stages(path):
+    """Return the (name, function) stages for an App Store file, in order."""
+    header = read_header(path)
+    return [
+        ('load', lambda _: list(iter_rows(path))),
+        ('validate', lambda rows: list(validate_rows(rows, header, IOS_CHECKS))),
+        ('duplicate_scan', analysis(lambda rows: duplicate_report(rows, 1))),
+        ('is_english', lambda rows: list(english_only(rows, 1))),
+        ('free_filter', lambda rows: list(free_only(rows, 4, '0.0'))),
+        ('freq_table', analysis(lambda rows: freq_table(rows, -5))),
+        ('display_table', analysis(lambda rows: display_table(rows, -5, show=False))),
+        ('genre_averages', analysis(lambda rows: group_aggregate(rows, -5, 5, ('mean',)))),
+    ]
+
+
+def peak_memory(function, data):
+    tracemalloc.start()
+    try:
+        function(data)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_stages(store, stages, n_rows, measure_memory=True):
+    """Run `stages` in order, yielding one measurement dictionary per stage."""
+    data = None
+    for stage, function in stages:
+        n_input = n_rows if data is None else len(data)
+        start = time.perf_counter()
+        output = function(data)
+        seconds = time.perf_counter() - start
+
+        result = {
+            'store': store,
+            'stage': stage,
+            'size': n_rows,
+            'rows': n_input,
+            'seconds': seconds,
+            'rows_per_second': n_input / seconds if seconds else None,
+        }
+        if measure_memory:
+            result['peak_bytes'] = peak_memory(function, data)
+        yield result
+        data = output
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES[:2],
+                        help='row counts to generate (default: 10000 100000; the '
+                             'full scale is %s)' % ' '.join(map(str, DEFAULT_SIZES)))
+    parser.add_argument('--output', help='write the JSON lines here instead of stdout')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc runs')
+    parser.add_argument('--data-dir', help='keep the generated files here and reuse them')
+    arguments = parser.parse_args(argv)
+
+    if arguments.data_dir:
+        os.makedirs(arguments.data_dir, exist_ok=True)
+        run_sizes(arguments, arguments.data_dir)
+    else:
+        with tempfile.TemporaryDirectory() as data_dir:
+            run_sizes(arguments, data_dir)
+
+
+def run_sizes(arguments, data_dir):
+    """Generate (or reuse) the files in `data_dir` and benchmark every size."""
+    output = open(arguments.output, 'w') if arguments.output else sys.stdout
+
+    try:
+        for n_rows in arguments.sizes:
+            android_path = os.path.join(data_dir, 'googleplaystore_%d.csv' % n_rows)
+            ios_path = os.path.join(data_dir, 'AppleStore_%d.csv' % n_rows)
+            if not os.path.exists(android_path):
+                write_android(android_path, n_rows)
+            if not os.path.exists(ios_path):
+                write_ios(ios_path, n_rows)
+
+            for store, stages in (('android', android_stages(android_path)),
+                                  ('ios', ios_stages(ios_path))):
+                for result in run_stages(store, stages, n_rows, not arguments.no_memory):
+                    output.write(json.dumps(result) + '\n')
+                    output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+if __name__ == '__main__':
+    main()
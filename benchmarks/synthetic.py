@@ -0,0 +1,113 @@
+"""Synthetic Google Play and App Store files with the real headers.
+
+The values follow the shape of the real data sets closely enough for the
+cleaning stages to do real work: about 10% of the apps appear more than once
+(with different review counts), a few names are non-English, most apps are
+free, and categories/genres/installs use the real vocabularies.
+"""
+
+import random
+
+from app_profiles.installs import INSTALL_BUCKETS
+from app_profiles.loading import write_rows
+
+ANDROID_HEADER = ['App', 'Category', 'Rating', 'Reviews', 'Size', 'Installs', 'Type',
+                  'Price', 'Content Rating', 'Genres', 'Last Updated', 'Current Ver',
+                  'Android Ver']
+IOS_HEADER = ['id', 'track_name', 'size_bytes', 'currency', 'price', 'rating_count_tot',
+              'rating_count_ver', 'user_rating', 'user_rating_ver', 'ver', 'cont_rating',
+              'prime_genre', 'sup_devices.num', 'ipadSc_urls.num', 'lang.num', 'vpp_lic']
+
+ANDROID_CATEGORIES = [
+    'ART_AND_DESIGN', 'AUTO_AND_VEHICLES', 'BEAUTY', 'BOOKS_AND_REFERENCE', 'BUSINESS',
+    'COMICS', 'COMMUNICATION', 'DATING', 'EDUCATION', 'ENTERTAINMENT', 'EVENTS', 'FAMILY',
+    'FINANCE', 'FOOD_AND_DRINK', 'GAME', 'HEALTH_AND_FITNESS', 'HOUSE_AND_HOME',
+    'LIBRARIES_AND_DEMO', 'LIFESTYLE', 'MAPS_AND_NAVIGATION', 'MEDICAL',
+    'NEWS_AND_MAGAZINES', 'PARENTING', 'PERSONALIZATION', 'PHOTOGRAPHY', 'PRODUCTIVITY',
+    'SHOPPING', 'SOCIAL', 'SPORTS', 'TOOLS', 'TRAVEL_AND_LOCAL', 'VIDEO_PLAYERS', 'WEATHER',
+]
+ANDROID_GENRES = ['Tools', 'Entertainment', 'Education', 'Business', 'Medical',
+                  'Education;Pretend Play', 'Puzzle;Brain Games', 'Art & Design;Creativity']
+CONTENT_RATINGS = ['Everyone', 'Everyone 10+', 'Teen', 'Mature 17+']
+IOS_GENRES = [
+    'Book', 'Business', 'Catalogs', 'Education', 'Entertainment', 'Finance',
+    'Food & Drink', 'Games', 'Health & Fitness', 'Lifestyle', 'Medical', 'Music',
+    'Navigation', 'News', 'Photo & Video', 'Productivity', 'Reference', 'Shopping',
+    'Social Networking', 'Sports', 'Travel', 'Utilities', 'Weather',
+]
+IOS_CONTENT_RATINGS = ['4+', '9+', '12+', '17+']
+
+WORDS = ['Photo', 'Editor', 'Free', 'Pro', 'Chat', 'Map', 'Go', 'HD', 'Lite', 'Scanner',
+         'Music', 'Puzzle', 'Weather', 'News', 'Fit', 'Cam']
+NON_ENGLISH = ['爱奇艺PPS', '欢乐颂2', 'Ирония', '電視劇熱播']
+SUFFIXES = [''] * 20 + ['™', ' 😜']
+
+
+def _name(rng, number):
+    name = '%s %s %d' % (rng.choice(WORDS), rng.choice(WORDS), number)
+    if rng.random() < 0.03:
+        return rng.choice(NON_ENGLISH) + ' ' + name
+    return name + rng.choice(SUFFIXES)
+
+
+def _app_numbers(rng, n_rows):
+    # About 10% of the rows repeat an app that was already listed.
+    n_apps = max(1, int(n_rows * 0.9))
+    for number in range(n_rows):
+        if number < n_apps:
+            yield number
+        else:
+            yield rng.randrange(n_apps)
+
+
+def android_rows(n_rows, seed=0):
+    """Yield `n_rows` synthetic Google Play rows."""
+    rng = random.Random(seed)
+    for number in _app_numbers(rng, n_rows):
+        app = random.Random(number)
+        price = '0' if app.random() < 0.92 else '$%.2f' % (app.randrange(99, 2999) / 100)
+        yield [
+            _name(app, number),
+            app.choice(ANDROID_CATEGORIES),
+            '%.1f' % app.uniform(1, 5),
+            str(rng.randrange(10 ** 6)),
+            '%dM' % app.randrange(1, 100),
+            '{:,}+'.format(app.choice(INSTALL_BUCKETS)),
+            'Free' if price == '0' else 'Paid',
+            price,
+            app.choice(CONTENT_RATINGS),
+            app.choice(ANDROID_GENRES),
+            'January 7, 2018',
+            '1.0.0',
+            '4.0.3 and up',
+        ]
+
+
+def ios_rows(n_rows, seed=0):
+    """Yield `n_rows` synthetic App Store rows."""
+    rng = random.Random(seed)
+    for number in _app_numbers(rng, n_rows):
+        app = random.Random(number)
+        yield [
+            str(280000000 + number),
+            _name(app, number),
+            str(app.randrange(10 ** 6, 10 ** 9)),
+            'USD',
+            '0.0' if app.random() < 0.55 else '%.2f' % (app.randrange(99, 2999) / 100),
+            str(rng.randrange(10 ** 6)),
+            str(rng.randrange(10 ** 4)),
+            '%.1f' % (app.randrange(0, 11) / 2),
+            '%.1f' % (app.randrange(0, 11) / 2),
+            '1.0',
+            app.choice(IOS_CONTENT_RATINGS),
+            app.choice(IOS_GENRES),
+            '37', '5', '1', '1',
+        ]
+
+
+def write_android(path, n_rows, seed=0):
+    write_rows(path, ANDROID_HEADER, android_rows(n_rows, seed))
+
+
+def write_ios(path, n_rows, seed=0):
+    write_rows(path, IOS_HEADER, ios_rows(n_rows, seed))
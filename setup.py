@@ -0,0 +1,17 @@
+"""Builds the optional C kernels used by app_profiles.kernels.
+
+    python setup.py build_ext --inplace
+
+If there is no C compiler the build is skipped with a warning and the
+pure-Python code is used instead.
+"""
+
+from setuptools import Extension, setup
+
+setup(
+    name='app_profiles',
+    packages=['app_profiles'],
+    ext_modules=[
+        Extension('app_profiles._speedups', ['app_profiles/_speedups.c'], optional=True),
+    ],
+)
@@ -0,0 +1,81 @@
+import os
+
+import pytest
+
+from app_profiles.aggregate import below, group_aggregate, robust_aggregate
+from app_profiles.columnar import android_table
+from app_profiles.installs import parse_installs
+from app_profiles.pipeline import ANDROID, clean_store
+from benchmarks.group_aggregate import make_rows, nested_loop_means
+
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AGGS = ('count', 'sum', 'mean', 'median', 'min', 'max')
+
+
+@pytest.fixture(scope='module')
+def android_final():
+    return clean_store([os.path.join(DATA_DIR, 'googleplaystore.csv')], ANDROID)
+
+
+def notebook_install_means(android_final):
+    # The notebook's loop over the Installs column, one scan per category.
+    means = {}
+    for category in dict.fromkeys(app[1] for app in android_final):
+        total = 0
+        len_category = 0
+        for app in android_final:
+            if app[1] == category:
+                n_installs = app[5]
+                n_installs = n_installs.replace(',', '')
+                n_installs = n_installs.replace('+', '')
+                total += float(n_installs)
+                len_category += 1
+        means[category] = total / len_category
+    return means
+
+
+@pytest.mark.parametrize('n_categories', [1, 10, 500])
+def test_means_match_nested_loops(n_categories):
+    rows = make_rows(5000, n_categories)
+    groups = group_aggregate(rows, 0, 1, aggs=('mean',))
+    assert {category: groups[category]['mean'] for category in groups} == \
+        nested_loop_means(rows, 0, 1)
+
+
+def test_install_means_match_notebook(android_final):
+    header, rows = android_final
+    expected = notebook_install_means(rows)
+    groups = group_aggregate(rows, 1, 5, aggs=('mean',), parse=parse_installs)
+    assert list(groups) == list(expected)
+    assert {category: groups[category]['mean'] for category in groups} == expected
+    assert round(expected['COMMUNICATION']) == 38456119
+
+    table_groups = group_aggregate(android_table(header, rows), 'Category', 'Installs',
+                                   aggs=('mean',))
+    assert {category: table_groups[category]['mean'] for category in table_groups} == expected
+
+
+def test_other_aggregates():
+    rows = [['A', '1'], ['B', '5'], ['A', '3'], ['A', '2']]
+    groups = group_aggregate(rows, 0, 1, aggs=AGGS)
+    assert groups == {
+        'A': {'count': 3, 'sum': 6.0, 'mean': 2.0, 'median': 2.0, 'min': 1.0, 'max': 3.0},
+        'B': {'count': 1, 'sum': 5.0, 'mean': 5.0, 'median': 5.0, 'min': 5.0, 'max': 5.0},
+    }
+    with pytest.raises(ValueError):
+        group_aggregate(rows, 0, 1, aggs=('mode',))
+
+
+def test_under_100_m_matches_notebook(android_final):
+    header, rows = android_final
+    under_100_m = []
+    for app in rows:
+        n_installs = float(app[5].replace(',', '').replace('+', ''))
+        if app[1] == 'COMMUNICATION' and n_installs < 100000000:
+            under_100_m.append(n_installs)
+
+    result = robust_aggregate(rows, 1, 5, parse=parse_installs,
+                              outliers=below(100000000))['COMMUNICATION']
+    assert result['kept'] == len(under_100_m)
+    assert result['mean'] == pytest.approx(sum(under_100_m) / len(under_100_m))
+
@@ -0,0 +1,104 @@
+import math
+import os
+
+import pytest
+
+from app_profiles.binstore import convert_android, convert_csv, open_table, write_table
+from app_profiles.columnar import (ANDROID_CATEGORICAL, ANDROID_NUMERIC, ColumnTable,
+                                   IOS_CATEGORICAL, IOS_NUMERIC)
+from app_profiles.loading import iter_rows, read_header, write_rows
+from app_profiles.tables import explore_data, freq_table
+from app_profiles.validation import (ANDROID_CHECKS, IOS_CHECKS, Quarantine, table_checks,
+                                     validate_rows)
+
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STORES = [
+    ('googleplaystore.csv', ANDROID_NUMERIC, ANDROID_CATEGORICAL, ANDROID_CHECKS),
+    ('AppleStore.csv', IOS_NUMERIC, IOS_CATEGORICAL, IOS_CHECKS),
+]
+
+
+def load_csv(path, numeric, categorical, checks):
+    header = read_header(path)
+    rows = validate_rows(iter_rows(path), header, table_checks(numeric, checks))
+    return ColumnTable.from_rows(header, rows, numeric, categorical)
+
+
+def same_value(left, right):
+    if isinstance(left, float) and math.isnan(left):
+        return isinstance(right, float) and math.isnan(right)
+    return left == right
+
+
+@pytest.mark.parametrize('name, numeric, categorical, checks', STORES)
+def test_round_trip(tmp_path, name, numeric, categorical, checks):
+    path = os.path.join(DATA_DIR, name)
+    table_path = str(tmp_path / (name + '.table'))
+    convert_csv(path, table_path, numeric, categorical, checks)
+    from_csv = load_csv(path, numeric, categorical, checks)
+
+    with open_table(table_path) as mapped:
+        assert mapped.header == from_csv.header
+        assert len(mapped) == len(from_csv)
+        for position in range(len(from_csv)):
+            assert all(map(same_value, mapped.row(position), from_csv.row(position)))
+    assert os.listdir(str(tmp_path)) == [name + '.table']
+
+
+def test_conversion_quarantines_unparsable_rows(tmp_path):
+    path = os.path.join(DATA_DIR, 'googleplaystore.csv')
+    rows = list(iter_rows(path))[:20]
+    rows[3][3] = '3.0M'
+    rows[5][5] = 'Free'
+    csv_path = str(tmp_path / 'small.csv')
+    write_rows(csv_path, read_header(path), rows)
+
+    quarantine = Quarantine()
+    table_path = str(tmp_path / 'small.table')
+    assert convert_android(csv_path, table_path, quarantine) == 18
+    assert [(position, reasons) for source, position, row, reasons in quarantine.rejects] == \
+        [(3, ['non-numeric Reviews']), (5, ['non-numeric Installs'])]
+    with open_table(table_path) as mapped:
+        assert list(mapped['App']) == [row[0] for row in rows[:3] + rows[4:5] + rows[6:]]
+
+
+def test_empty_and_unicode_strings(tmp_path):
+    table = ColumnTable.from_rows(['name', 'score'], [['', '1'], ['爱奇艺 😜', '2.5']],
+                                  {'score': float})
+    table_path = str(tmp_path / 'small.table')
+    write_table(table, table_path)
+    with open_table(table_path) as mapped:
+        assert list(mapped.rows()) == [['', 1.0], ['爱奇艺 😜', 2.5]]
+
+
+def test_freq_table_and_explore_data_on_mapped_table(tmp_path, capsys):
+    rows = [['A', 'GAME'], ['B', 'BOOKS'], ['C', 'GAME'], ['D', 'GAME']]
+    table = ColumnTable.from_rows(['App', 'Category'], rows, categorical=('Category',))
+    table_path = str(tmp_path / 'small.table')
+    write_table(table, table_path)
+
+    with open_table(table_path) as mapped:
+        assert freq_table(mapped, 'Category') == freq_table(rows, 1)
+        assert freq_table(mapped, 'App') == freq_table(rows, 0)
+        # Codes of values missing from a subset are not listed.
+        assert freq_table(mapped.take([1]), 'Category') == {'BOOKS': 100.0}
+
+        explore_data(mapped, 1, 3, True)
+        assert capsys.readouterr().out == ("['B', 'BOOKS']\n\n\n['C', 'GAME']\n\n\n"
+                                           "Number of rows: 4\nNumber of columns: 2\n")
+
+
+def test_close_with_live_slice_keeps_table_open(tmp_path):
+    table = ColumnTable.from_rows(['score'], [['1'], ['2']], {'score': float})
+    table_path = str(tmp_path / 'small.table')
+    write_table(table, table_path)
+
+    mapped = open_table(table_path)
+    first = mapped['score'][:1]
+    with pytest.raises(BufferError):
+        mapped.close()
+    assert list(mapped['score']) == [1.0, 2.0]
+
+    first.release()
+    mapped.close()
+    assert mapped.columns == {}
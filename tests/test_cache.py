@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+from app_profiles import cache
+from app_profiles.columnar import ANDROID_CATEGORICAL, ANDROID_NUMERIC
+from app_profiles.loading import iter_rows, read_header, write_rows
+from app_profiles.pipeline import ANDROID, clean_store
+
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def shards(tmp_path):
+    path = os.path.join(DATA_DIR, 'googleplaystore.csv')
+    header = read_header(path)
+    rows = list(iter_rows(path))
+    paths = [str(tmp_path / 'shard_0.csv'), str(tmp_path / 'shard_1.csv')]
+    write_rows(paths[0], header, rows[:5000])
+    write_rows(paths[1], header, rows[5000:])
+    return paths
+
+
+@pytest.fixture
+def clean_calls(monkeypatch):
+    """Record every call to the cleaning behind the cache."""
+    calls = []
+    clean = cache._clean
+
+    def counting_clean(*args):
+        calls.append(args)
+        return clean(*args)
+
+    monkeypatch.setattr(cache, '_clean', counting_clean)
+    return calls
+
+
+def test_warm_run_skips_cleaning(tmp_path, shards, clean_calls):
+    cache_dir = str(tmp_path / 'cache')
+    cold = cache.cached_clean(shards, ANDROID, cache_dir)
+    warm = cache.cached_clean(shards, ANDROID, cache_dir)
+
+    assert len(clean_calls) == 1
+    assert warm == cold == clean_store(shards, ANDROID)
+    assert len(os.listdir(cache_dir)) == 1
+
+
+def test_changed_shard_or_parameters_rebuild(tmp_path, shards, clean_calls):
+    cache_dir = str(tmp_path / 'cache')
+    header, rows = cache.cached_clean(shards, ANDROID, cache_dir)
+
+    shard_rows = list(iter_rows(shards[1]))
+    write_rows(shards[1], read_header(shards[1]), shard_rows[:-100])
+    header, fewer_rows = cache.cached_clean(shards, ANDROID, cache_dir)
+    assert len(clean_calls) == 2
+    assert len(os.listdir(cache_dir)) == 2
+    assert fewer_rows == clean_store(shards, ANDROID)[1] != rows
+
+    cache.cached_clean(shards, dict(ANDROID, dedup_key=(0, 1)), cache_dir)
+    assert len(clean_calls) == 3
+    assert len(os.listdir(cache_dir)) == 3
+
+
+def test_cached_table(tmp_path, shards, clean_calls):
+    cache_dir = str(tmp_path / 'cache')
+    rows = clean_store(shards, ANDROID)[1]
+    for _ in range(2):
+        with cache.cached_table(shards, ANDROID, cache_dir, ANDROID_NUMERIC,
+                                ANDROID_CATEGORICAL) as table:
+            assert len(table) == len(rows)
+            assert list(table['App']) == [row[0] for row in rows]
+    assert len(clean_calls) == 1
+
+    # Other column types are another entry.
+    with cache.cached_table(shards, ANDROID, cache_dir, {'Reviews': float}) as table:
+        assert list(table['Reviews']) == [float(row[3]) for row in rows]
+    assert len(clean_calls) == 2
+    assert len(os.listdir(cache_dir)) == 2
@@ -0,0 +1,33 @@
+import csv
+import json
+import os
+
+from app_profiles.cli import main
+
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IOS = os.path.join(DATA_DIR, 'AppleStore.csv')
+
+
+def test_drilldowns_keep_apps_sharing_a_name(tmp_path):
+    output = str(tmp_path / 'report.json')
+    main(['--ios', IOS, '--section', 'drilldowns', '--category', 'Games', '--output', output])
+    with open(output, encoding='utf8') as report_file:
+        games = json.load(report_file)['drilldowns']['ios']['Games']
+
+    names = [name for name, n_ratings in games]
+    assert names.count('Mannequin Challenge') == 2
+    assert names.count('VR Roller Coaster') == 2
+    ratings = [n_ratings for name, n_ratings in games]
+    assert ratings == sorted(ratings, reverse=True)
+
+
+def test_csv_rows_of_drilldowns(tmp_path):
+    output = str(tmp_path / 'report.csv')
+    main(['--ios', IOS, '--section', 'drilldowns', '--category', 'Navigation', '--limit', '2',
+          '--format', 'csv', '--output', output])
+    with open(output, encoding='utf8', newline='') as report_file:
+        rows = list(csv.reader(report_file))
+
+    assert rows[0] == ['section', 'store', 'metric', 'key', 'value']
+    assert [row[:3] for row in rows[1:]] == [['drilldowns', 'ios', 'Navigation']] * 2
+    assert rows[1][3] == 'Waze - GPS Navigation, Maps & Real-time Traffic'
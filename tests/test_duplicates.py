@@ -0,0 +1,98 @@
+import os
+
+from app_profiles.duplicates import best_rows, duplicate_report, merge_best_rows, remove_duplicates
+from app_profiles.loading import iter_rows, read_header
+from app_profiles.validation import ANDROID_CHECKS, validate_rows
+from benchmarks.duplicates import list_duplicates, make_rows
+
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def android_rows():
+    path = os.path.join(DATA_DIR, 'googleplaystore.csv')
+    return list(validate_rows(iter_rows(path), read_header(path), ANDROID_CHECKS))
+
+
+def test_duplicate_report_matches_list_scan():
+    for seed in range(3):
+        rows = make_rows(3000, seed=seed)
+        duplicate_apps = list_duplicates(rows)
+        report = duplicate_report(rows)
+        assert report['n_duplicates'] == len(duplicate_apps)
+        assert report['examples'] == duplicate_apps[:15]
+        assert sum(report['counts'].values()) - len(report['counts']) == len(duplicate_apps)
+
+
+def test_duplicate_report_on_google_play():
+    rows = android_rows()
+    report = duplicate_report(iter(rows))
+    assert report['n_duplicates'] == len(list_duplicates(rows)) == 1181
+    assert report['examples'][:3] == ['Quick PDF Scanner + OCR FREE', 'Box', 'Google My Business']
+    assert report['counts']['Instagram'] == 4
+
+
+def notebook_clean(rows):
+    # The notebook's two passes: highest Reviews per name, then the first
+    # row reaching it.
+    reviews_max = {}
+    for app in rows:
+        name = app[0]
+        n_reviews = float(app[3])
+        if name in reviews_max and reviews_max[name] < n_reviews:
+            reviews_max[name] = n_reviews
+        elif name not in reviews_max:
+            reviews_max[name] = n_reviews
+
+    android_clean = []
+    already_added = []
+    for app in rows:
+        name = app[0]
+        n_reviews = float(app[3])
+        if (reviews_max[name] == n_reviews) and (name not in already_added):
+            android_clean.append(app)
+            already_added.append(name)
+    return android_clean
+
+
+def test_remove_duplicates_matches_notebook():
+    rows = android_rows()
+    android_clean = remove_duplicates(iter(rows))
+    assert len(android_clean) == 9659
+    assert android_clean == notebook_clean(rows)
+
+
+def test_ties_keep_the_earliest_row_in_input_order():
+    rows = [
+        ['Box', 'BUSINESS', '159872', 'first'],
+        ['Maps', 'TRAVEL', '10', 'only'],
+        ['Box', 'BUSINESS', '159872', 'second'],
+        ['Box', 'BUSINESS', '159872', 'third'],
+        ['Chat', 'SOCIAL', '5', 'low'],
+        ['Chat', 'SOCIAL', '7', 'high'],
+    ]
+    kept = remove_duplicates(rows, winner=2)
+    assert [row[3] for row in kept] == ['first', 'only', 'high']
+
+
+def test_tuple_key():
+    rows = [
+        ['Solitaire', 'GAME', '10'],
+        ['Solitaire', 'FAMILY', '20'],
+        ['Solitaire', 'GAME', '30'],
+    ]
+    assert remove_duplicates(rows, key=(0, 1), winner=2) == [rows[1], rows[2]]
+    assert remove_duplicates(rows, key=0, winner=2) == [rows[2]]
+
+
+def test_merged_shards_match_one_pass():
+    rows = android_rows()
+    expected = best_rows(rows)
+
+    shards = [rows[start:start + 2500] for start in range(0, len(rows), 2500)]
+    merged = merge_best_rows(best_rows(shard) for shard in shards)
+    assert list(merged) == list(expected)
+    offsets = [0]
+    for shard in shards:
+        offsets.append(offsets[-1] + len(shard))
+    for app_key, (n_reviews, shard, position, row) in merged.items():
+        assert expected[app_key] == (n_reviews, offsets[shard] + position, row)
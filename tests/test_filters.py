@@ -0,0 +1,25 @@
+from app_profiles.filters import english_mask, english_only, is_english
+
+NAMES = [
+    'Instagram',
+    '',
+    '爱奇艺PPS -《欢乐颂2》电视剧热播',
+    'Docs To Go™ Free Office Suite',
+    'Instachat 😜',
+    'Ab😜😜😜',
+    'Ab😜😜😜😜',
+    'Café — Crème ✓',
+    'é' * 3,
+    'é' * 4,
+    '\x7f',
+    '\x80' * 4,
+]
+
+
+def test_english_mask_matches_is_english():
+    assert english_mask(NAMES) == [is_english(name) for name in NAMES]
+
+
+def test_english_only_matches_is_english():
+    rows = [[name, str(position)] for position, name in enumerate(NAMES)]
+    assert list(english_only(rows, 0)) == [row for row in rows if is_english(row[0])]
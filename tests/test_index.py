@@ -0,0 +1,22 @@
+from app_profiles.index import GroupIndex
+
+ROWS = [
+    ['A', 'GAME', '10'],
+    ['B', 'BOOKS', '500'],
+    ['C', 'GAME', '300'],
+    ['D', 'GAME', '300'],
+]
+
+
+def test_positions_sorted_with_threshold_and_limit():
+    index = GroupIndex(ROWS, 1, sort_by=2)
+    assert index.positions('GAME') == [2, 3, 0]
+    assert index.positions('GAME', at_least=300) == [2, 3]
+    assert index.positions('GAME', limit=1, at_least=10) == [2]
+
+
+def test_unknown_group_is_empty():
+    index = GroupIndex(ROWS, 1, sort_by=2)
+    assert index.positions('UNKNOWN') == []
+    assert index.positions('UNKNOWN', at_least=100) == []
+    assert index.rows('UNKNOWN', limit=3, at_least=100) == []
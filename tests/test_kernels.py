@@ -0,0 +1,94 @@
+import os
+
+import pytest
+
+from app_profiles import kernels
+from app_profiles.columnar import android_table
+from app_profiles.duplicates import remove_duplicates
+from app_profiles.filters import english_only, is_english
+from app_profiles.installs import parse_installs
+from app_profiles.loading import iter_rows, read_header
+from app_profiles.validation import ANDROID_CHECKS, validate_rows
+
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+EDGE_NAMES = ['Instagram', '', '爱奇艺PPS -《欢乐颂2》电视剧热播', 'Docs To Go™ Free Office Suite',
+              'Instachat 😜', 'Ab😜😜😜', 'Ab😜😜😜😜', 'é' * 3, 'é' * 4, '\x7f', '\x80' * 4]
+EDGE_INSTALLS = ['0', '0+', '1+', '1,000,000,000+', '007', '99999999999999999999999+', ' 10 ']
+EDGE_FLOATS = ['0', '3.5', 'NaN', '1e3', ' 7 ', '12345678901234567890', '1_000', '-0']
+BAD_VALUES = [('parse_installs', ['Free']), ('parse_installs', ['']), ('parse_installs', ['+']),
+              ('parse_floats', ['3.0M']), ('parse_floats', [''])]
+
+c_only = pytest.mark.skipif(not kernels.ACCELERATED, reason='C extension not built')
+
+
+def same(left, right):
+    # repr tells 1 from 1.0 and matches NaN with NaN.
+    return list(map(repr, left)) == list(map(repr, right))
+
+
+def test_python_english_mask():
+    assert kernels.python_english_mask(EDGE_NAMES) == [is_english(name) for name in EDGE_NAMES]
+
+
+def test_python_parse_installs():
+    expected = [int(value.replace(',', '').replace('+', '')) for value in EDGE_INSTALLS]
+    assert same(kernels.python_parse_installs(EDGE_INSTALLS), expected)
+
+
+def test_python_parse_floats():
+    assert same(kernels.python_parse_floats(EDGE_FLOATS), [float(value) for value in EDGE_FLOATS])
+
+
+@pytest.mark.parametrize('function_name, values', BAD_VALUES)
+def test_python_bad_values(function_name, values):
+    with pytest.raises(ValueError):
+        getattr(kernels, 'python_' + function_name)(values)
+
+
+@c_only
+@pytest.mark.parametrize('function_name, values', [
+    ('english_mask', EDGE_NAMES),
+    ('parse_installs', EDGE_INSTALLS),
+    ('parse_floats', EDGE_FLOATS),
+])
+def test_c_matches_python(function_name, values):
+    expected = getattr(kernels, 'python_' + function_name)(values)
+    assert same(getattr(kernels, function_name)(values), expected)
+
+
+@c_only
+@pytest.mark.parametrize('function_name, values', BAD_VALUES)
+def test_c_bad_values(function_name, values):
+    with pytest.raises(ValueError):
+        getattr(kernels, function_name)(values)
+
+
+def test_batches():
+    assert list(kernels.batches(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(kernels.batches([], 2)) == []
+
+
+def test_batch_parser():
+    assert kernels.batch_parser(float) is kernels.parse_floats
+    assert kernels.batch_parser(parse_installs) is kernels.parse_installs
+    assert kernels.batch_parser(len)(['ab', '']) == [2, 0]
+
+
+def clean_android():
+    path = os.path.join(DATA_DIR, 'googleplaystore.csv')
+    header = read_header(path)
+    rows = list(validate_rows(iter_rows(path), header, ANDROID_CHECKS))
+    table = android_table(header, rows)
+    return list(english_only(rows, 0)), remove_duplicates(rows), [table.row(i) for i in
+                                                                   range(len(table))]
+
+
+@c_only
+def test_stages_give_the_same_result_on_both_paths(monkeypatch):
+    accelerated = clean_android()
+    monkeypatch.setattr(kernels, '_speedups', None)
+    python = clean_android()
+    assert accelerated[0] == python[0]
+    assert accelerated[1] == python[1]
+    assert all(same(left, right) for left, right in zip(accelerated[2], python[2]))
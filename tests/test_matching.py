@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+from app_profiles.loading import iter_rows
+from app_profiles.matching import match_apps, normalize_name, trigrams
+
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ANDROID = [['Facebook'], ['Google Maps™'], ['Instachat 😜'], ['Candy Crush Saga'],
+           ['Candy Crush Soda Saga'], ['Photo Editor Pro'], ['Photo Editor'], ['Weather!'],
+           ['爱奇艺'], ['Zzz unknown']]
+IOS = [['1', 'facebook'], ['2', 'Google Maps - Transit & Food'], ['3', 'Instachat'],
+       ['4', 'Candy Crush Saga'], ['5', 'Candy Crush Jelly Saga'], ['6', 'Photo Editor+'],
+       ['7', 'Photo Editor Pro HD'], ['8', 'The Weather Channel'], ['9', 'Facebook']]
+
+
+def all_pairs(android, ios, threshold):
+    """The fuzzy matches found by comparing every pair of names."""
+    exact = {normalize_name(row[1]) for row in ios}
+    ios_grams = [trigrams(normalize_name(row[1])) for row in ios]
+    matches = []
+    for row in android:
+        key = normalize_name(row[0])
+        if not key or key in exact:
+            continue
+        grams = trigrams(key)
+        best_score = 0
+        best_position = None
+        for position, other in enumerate(ios_grams):
+            shared = len(grams & other)
+            score = shared / (len(grams) + len(other) - shared)
+            if score > best_score:
+                best_score = score
+                best_position = position
+        if best_position is not None and best_score >= threshold:
+            matches.append((row, ios[best_position], best_score))
+    return matches
+
+
+def fuzzy_matches(android, ios, threshold):
+    return [match for match in match_apps(android, ios, fuzzy=True, threshold=threshold)
+            if match[2] < 1.0 or normalize_name(match[0][0]) != normalize_name(match[1][1])]
+
+
+def test_normalize_name():
+    assert normalize_name('Google Maps™') == 'google maps'
+    assert normalize_name('Instachat 😜') == 'instachat'
+    assert normalize_name('  Candy-Crush:  SAGA! ') == 'candy crush saga'
+    assert normalize_name('爱奇艺') == ''
+    assert normalize_name('Ab😜😜😜😜') == 'ab'
+
+
+def test_exact_matches():
+    matches = match_apps(ANDROID, IOS)
+    assert [(android[0], ios[0]) for android, ios, score in matches] == [
+        ('Facebook', '1'), ('Facebook', '9'), ('Instachat 😜', '3'), ('Candy Crush Saga', '4'),
+        ('Photo Editor', '6')]
+    assert {score for android, ios, score in matches} == {1.0}
+
+
+@pytest.mark.parametrize('threshold', [0.3, 0.5, 0.6, 0.8])
+def test_fuzzy_matches_equal_all_pairs_on_fixture(threshold):
+    assert fuzzy_matches(ANDROID, IOS, threshold) == all_pairs(ANDROID, IOS, threshold)
+
+
+@pytest.mark.parametrize('threshold', [0.4, 0.5, 0.6])
+def test_fuzzy_matches_equal_all_pairs_on_store_sample(threshold):
+    android = list(iter_rows(os.path.join(DATA_DIR, 'googleplaystore.csv')))[::50]
+    ios = list(iter_rows(os.path.join(DATA_DIR, 'AppleStore.csv')))[::5]
+    expected = all_pairs(android, ios, threshold)
+    assert expected
+    assert fuzzy_matches(android, ios, threshold) == expected
@@ -0,0 +1,97 @@
+import os
+
+import pytest
+
+from app_profiles.filters import is_english
+from app_profiles.loading import iter_rows, read_header, write_rows
+from app_profiles.pipeline import ANDROID, IOS, clean_store, clean_to_csv
+from app_profiles.validation import ANDROID_CHECKS, Quarantine, validate_rows
+
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def write_shards(directory, name, n_shards):
+    """Split the store file `name` into `n_shards` CSV files in `directory`."""
+    path = os.path.join(DATA_DIR, name)
+    header = read_header(path)
+    rows = list(iter_rows(path))
+    size = len(rows) // n_shards + 1
+    paths = []
+    for shard in range(n_shards):
+        shard_path = os.path.join(str(directory), '%s.%d.csv' % (name, shard))
+        write_rows(shard_path, header, rows[shard * size:(shard + 1) * size])
+        paths.append(shard_path)
+    return paths
+
+
+def notebook_android_final():
+    # The notebook's steps: drop bad rows, keep the first row with the most
+    # reviews per app, then English names and free apps.
+    path = os.path.join(DATA_DIR, 'googleplaystore.csv')
+    android = list(validate_rows(iter_rows(path), read_header(path), ANDROID_CHECKS))
+    reviews_max = {}
+    for app in android:
+        reviews_max[app[0]] = max(reviews_max.get(app[0], -1), float(app[3]))
+    android_clean = []
+    already_added = set()
+    for app in android:
+        if reviews_max[app[0]] == float(app[3]) and app[0] not in already_added:
+            android_clean.append(app)
+            already_added.add(app[0])
+    return [app for app in android_clean if is_english(app[0]) and app[7] == '0']
+
+
+@pytest.mark.parametrize('name, store, n_rows', [
+    ('googleplaystore.csv', ANDROID, 8864),
+    ('AppleStore.csv', IOS, 3222),
+])
+def test_parallel_output_is_byte_identical(tmp_path, name, store, n_rows):
+    paths = write_shards(tmp_path, name, 5)
+    serial_path = str(tmp_path / 'serial.csv')
+    parallel_path = str(tmp_path / 'parallel.csv')
+
+    serial_quarantine = Quarantine()
+    parallel_quarantine = Quarantine()
+    assert clean_to_csv(paths, store, serial_path, parallel=False,
+                        quarantine=serial_quarantine) == n_rows
+    assert clean_to_csv(paths, store, parallel_path, parallel=True, max_workers=2,
+                        quarantine=parallel_quarantine) == n_rows
+
+    with open(serial_path, 'rb') as serial, open(parallel_path, 'rb') as parallel:
+        assert serial.read() == parallel.read()
+    assert len(serial_quarantine) == len(parallel_quarantine)
+
+
+def test_shards_give_the_notebook_android_final(tmp_path):
+    expected = notebook_android_final()
+    assert len(expected) == 8864
+
+    header, single = clean_store([os.path.join(DATA_DIR, 'googleplaystore.csv')], ANDROID)
+    assert single == expected
+    header, sharded = clean_store(write_shards(tmp_path, 'googleplaystore.csv', 5), ANDROID)
+    assert sharded == expected
+
+
+def test_tie_across_shards_keeps_the_earlier_shard(tmp_path):
+    header = read_header(os.path.join(DATA_DIR, 'googleplaystore.csv'))
+
+    def app(name, reviews, price):
+        app_type = 'Free' if price == '0' else 'Paid'
+        return [name, 'BUSINESS', '4.3', reviews, '10M', '1,000+', app_type, price,
+                'Everyone', 'Business', 'May 1, 2018', '1.0', '4.0']
+
+    shards = [
+        [app('Box', '100', '0'), app('Other', '1', '0')],
+        [app('Box', '100', '$1.99'), app('Other', '2', '0')],
+    ]
+    paths = []
+    for position, rows in enumerate(shards):
+        path = str(tmp_path / ('shard_%d.csv' % position))
+        write_rows(path, header, rows)
+        paths.append(path)
+
+    expected = [shards[0][0], shards[1][1]]
+    assert clean_store(paths, ANDROID)[1] == expected
+    # Reversing the shards makes the paid Box row win the tie and the free
+    # filter drop it.
+    assert clean_store(paths[::-1], ANDROID)[1] == [shards[1][1]]
@@ -0,0 +1,103 @@
+import os
+
+import pytest
+
+from app_profiles.aggregate import group_aggregate
+from app_profiles.filters import is_english
+from app_profiles.installs import parse_installs
+from app_profiles.pipeline import ANDROID, clean_store
+from app_profiles.query import Dataset, col
+from app_profiles.validation import ANDROID_CHECKS
+
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ANDROID_PATH = os.path.join(DATA_DIR, 'googleplaystore.csv')
+
+HEADER = ['App', 'Category', 'Reviews', 'Price']
+ROWS = [
+    ['Box', 'BUSINESS', '100', '0'],
+    ['Chat', 'SOCIAL', '2000', '0'],
+    ['Box', 'BUSINESS', '300', '0'],
+    ['Maps', 'TRAVEL', '50', '$1.99'],
+    ['Game 😜😜😜😜', 'GAME', '70', '0'],
+]
+
+
+def android_final_plan():
+    return (Dataset.scan(ANDROID_PATH)
+            .validate(ANDROID_CHECKS)
+            .dedup('App', winner='Reviews')
+            .filter(is_english, col='App')
+            .filter(col('Price') == '0'))
+
+
+def test_explain():
+    plan = android_final_plan()
+    assert plan.explain() == '\n'.join([
+        'scan %s' % ANDROID_PATH,
+        '  -> validate Rating outside 0-5, non-numeric Reviews, non-numeric Price',
+        "  -> dedup key='App' winner='Reviews' (holds one row per key)",
+        '  -> filter is_english(App)',
+        "  -> filter Price == '0'",
+    ])
+    assert plan.group_by('Category').explain() == plan.explain() + "\n  -> group_by 'Category'"
+
+
+def test_plan_counts_like_the_pipeline():
+    plan = android_final_plan()
+    header, rows = clean_store([ANDROID_PATH], ANDROID)
+    assert plan.count() == len(rows) == 8864
+    assert plan.collect() == rows
+
+    means = plan.group_by('Category').mean('Installs', parse=parse_installs)
+    groups = group_aggregate(rows, 1, 5, ('mean',), parse_installs)
+    assert means == {group: groups[group]['mean'] for group in groups}
+
+
+def test_comparisons_with_parse():
+    dataset = Dataset.from_rows(HEADER, ROWS)
+    reviews = col('Reviews', parse=float)
+    assert repr(reviews >= 300) == 'float(Reviews) >= 300'
+    assert [row[0] for row in dataset.filter(reviews >= 300)] == ['Chat', 'Box']
+    assert [row[0] for row in dataset.filter(col('Price') != '0')] == ['Maps']
+    # Without parse, values compare as strings.
+    assert [row[0] for row in dataset.filter(col('Reviews') > '300')] == ['Maps', 'Game 😜😜😜😜']
+
+
+def test_filter_forms():
+    dataset = Dataset.from_rows(HEADER, ROWS)
+    by_column = dataset.filter(is_english, col='App')
+    by_row = dataset.filter(lambda row: is_english(row[0]))
+    by_index = dataset.filter(is_english, col=0)
+    assert by_column.collect() == by_row.collect() == by_index.collect() == ROWS[:4]
+    assert by_column.explain().endswith('filter is_english(App)')
+    assert by_row.explain().endswith('filter <lambda>(row)')
+
+
+def test_steps_run_lazily_and_can_rerun():
+    calls = []
+
+    def recording(row):
+        calls.append(row[0])
+        return True
+
+    plan = Dataset.from_rows(HEADER, ROWS).filter(recording).dedup(('App', 'Category'), 'Reviews')
+    assert calls == []
+    # Kept rows come out in the order of the winning rows.
+    assert [row[2] for row in plan] == ['2000', '300', '50', '70']
+    assert plan.count() == 4
+    assert len(calls) == 2 * len(ROWS)
+
+
+def test_grouped_aggregates():
+    grouped = Dataset.from_rows(HEADER, ROWS).group_by('Category')
+    assert grouped.count() == {'BUSINESS': 2, 'SOCIAL': 1, 'TRAVEL': 1, 'GAME': 1}
+    assert grouped.sum('Reviews') == {'BUSINESS': 400.0, 'SOCIAL': 2000.0, 'TRAVEL': 50.0,
+                                      'GAME': 70.0}
+    assert grouped.median('Reviews')['BUSINESS'] == 200.0
+    assert Dataset.from_rows(HEADER, ROWS).freq_table('Price').percentages() == \
+        {'0': 80.0, '$1.99': 20.0}
+
+
+def test_unknown_column():
+    with pytest.raises(KeyError):
+        Dataset.from_rows(HEADER, ROWS).filter(col('Installs') == '0')
@@ -0,0 +1,77 @@
+import bisect
+import math
+
+import pytest
+
+from app_profiles.duplicates import duplicate_report
+from app_profiles.sketches import HyperLogLog, SpaceSaving, TDigest
+from app_profiles.tables import FreqCounter
+from benchmarks.synthetic import android_rows
+
+N_ROWS = 20000
+N_SHARDS = 4
+SEEDS = [0, 1, 2]
+
+
+def sharded(sketch_class, values, **options):
+    """Build one sketch per shard of `values` and merge them."""
+    sketches = [sketch_class(**options) for _ in range(N_SHARDS)]
+    for position, value in enumerate(values):
+        sketches[position % N_SHARDS].add(value)
+    merged = sketches[0]
+    for sketch in sketches[1:]:
+        merged.merge(sketch)
+    return merged
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_hyperloglog_within_three_standard_errors(seed):
+    precision = 12
+    rows = list(android_rows(N_ROWS, seed))
+    n_distinct = len(rows) - duplicate_report(rows)['n_duplicates']
+    sketch = sharded(HyperLogLog, [row[0] for row in rows], precision=precision)
+
+    error = abs(sketch.count() - n_distinct) / n_distinct
+    assert error <= 3 * 1.04 / math.sqrt(2 ** precision)
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_space_saving_bounds(seed):
+    k = 20
+    rows = list(android_rows(N_ROWS, seed))
+    exact = FreqCounter(1).update(rows)
+    sketch = sharded(SpaceSaving, [row[1] for row in rows], k=k)
+
+    bound = sketch.total / k
+    assert sketch.total == exact.total
+    for value, count, error in sketch.top():
+        true_count = exact.counts[value]
+        assert true_count <= count <= true_count + error <= true_count + bound
+    for value, true_count in exact.counts.items():
+        if true_count > bound:
+            assert value in sketch.counts
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_tdigest_quantile_rank_error(seed):
+    rows = list(android_rows(N_ROWS, seed))
+    numbers = [float(row[3]) for row in rows]
+    values = sorted(numbers)
+    digest = sharded(TDigest, numbers)
+
+    for q in (0.01, 0.5, 0.9, 0.99):
+        estimate = digest.quantile(q)
+        # With ties, any rank between these two is right for the estimate.
+        low = bisect.bisect_left(values, estimate) / len(values)
+        high = bisect.bisect_right(values, estimate) / len(values)
+        assert max(0, low - q, q - high) <= 0.01
+
+
+def test_tdigest_extremes_and_single_value():
+    digest = TDigest()
+    digest.update([5.0])
+    assert digest.quantile(0) == digest.quantile(1) == 5.0
+
+    digest.update(range(1000))
+    assert digest.quantile(0) == 0
+    assert digest.quantile(1) == 999
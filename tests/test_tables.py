@@ -0,0 +1,25 @@
+from app_profiles.tables import display_table, explore_data, freq_table
+
+ROWS = [['A', 'GAME'], ['B', 'BOOKS'], ['C', 'GAME'], ['D', 'GAME']]
+
+
+def printed_rows(capsys):
+    return [line for line in capsys.readouterr().out.splitlines() if line]
+
+
+def test_explore_data_slices_lists(capsys):
+    explore_data(ROWS, -2, None)
+    assert printed_rows(capsys) == ["['C', 'GAME']", "['D', 'GAME']"]
+
+    explore_data(ROWS, 0, 1, True)
+    assert printed_rows(capsys) == ["['A', 'GAME']", 'Number of rows: 4', 'Number of columns: 2']
+
+
+def test_explore_data_on_a_generator(capsys):
+    explore_data((row for row in ROWS), 1, 3)
+    assert printed_rows(capsys) == ["['B', 'BOOKS']", "['C', 'GAME']"]
+
+
+def test_freq_and_display_table():
+    assert freq_table(iter(ROWS), 1) == {'GAME': 75.0, 'BOOKS': 25.0}
+    assert display_table(ROWS, 1, limit=1, show=False) == [('GAME', 75.0)]
@@ -0,0 +1,70 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from app_profiles.timeseries import AggregateStore, snapshot_aggregates
+
+ROWS = [['A', 'GAME', '100'], ['B', 'BOOKS', '10'], ['C', 'GAME', '300']]
+
+
+def test_append_and_trend(tmp_path):
+    store = AggregateStore(str(tmp_path))
+    store.append(datetime(2018, 9, 1), snapshot_aggregates(ROWS, 1, installs=2))
+    store.append(datetime(2018, 9, 2), snapshot_aggregates(ROWS[:2], 1, installs=2))
+
+    reopened = AggregateStore(str(tmp_path))
+    trend = reopened.trend(start=datetime(2018, 9, 2))
+    assert trend == {datetime(2018, 9, 2): {
+        'GAME': {'share': 50.0, 'average_installs': 100.0, 'average_ratings': 0.0},
+        'BOOKS': {'share': 50.0, 'average_installs': 10.0, 'average_ratings': 0.0},
+    }}
+
+
+def test_partial_lines_and_records_are_dropped(tmp_path):
+    store = AggregateStore(str(tmp_path))
+    store.append(datetime(2018, 9, 1), {'GAME': (2, 400.0, 0.0)})
+
+    # An append interrupted while writing a category and a record.
+    with open(os.path.join(str(tmp_path), 'categories.jsonl'), 'a', encoding='utf8') as lines:
+        lines.write('"PARTI')
+    with open(os.path.join(str(tmp_path), 'aggregates.bin'), 'ab') as records:
+        records.write(b'\0' * 5)
+
+    store = AggregateStore(str(tmp_path))
+    assert store.categories == ['GAME']
+    store.append(datetime(2018, 9, 2), {'BOOKS': (1, 10.0, 0.0)})
+
+    reopened = AggregateStore(str(tmp_path))
+    assert reopened.categories == ['GAME', 'BOOKS']
+    assert reopened.query() == [(datetime(2018, 9, 1), 'GAME', 2, 400.0, 0.0),
+                                (datetime(2018, 9, 2), 'BOOKS', 1, 10.0, 0.0)]
+
+
+def test_same_timestamp_is_rejected_or_replaced(tmp_path):
+    store = AggregateStore(str(tmp_path))
+    batch = {'GAME': (2, 200.0, 0.0), 'BOOKS': (2, 20.0, 0.0)}
+    store.append(datetime(2018, 9, 1), batch)
+
+    with pytest.raises(ValueError):
+        store.append(datetime(2018, 9, 1), batch)
+    with pytest.raises(ValueError):
+        store.append(datetime(2018, 9, 1, 0, 0, 0, 500000), batch)
+    assert store.trend()[datetime(2018, 9, 1)]['GAME']['share'] == 50.0
+
+    store.append(datetime(2018, 9, 1), {'GAME': (3, 300.0, 0.0), 'BOOKS': (1, 10.0, 0.0)},
+                 replace=True)
+    assert AggregateStore(str(tmp_path)).query() == [
+        (datetime(2018, 9, 1), 'GAME', 3, 300.0, 0.0),
+        (datetime(2018, 9, 1), 'BOOKS', 1, 10.0, 0.0),
+    ]
+    assert store.trend()[datetime(2018, 9, 1)]['GAME']['share'] == 75.0
+
+
+def test_replace_only_drops_the_last_snapshot(tmp_path):
+    store = AggregateStore(str(tmp_path))
+    store.append(datetime(2018, 9, 1), {'GAME': (1, 1.0, 0.0)})
+    store.append(datetime(2018, 9, 2), {'GAME': (2, 2.0, 0.0)})
+    store.append(datetime(2018, 9, 2), {'GAME': (4, 4.0, 0.0)}, replace=True)
+    store.append(datetime(2018, 9, 3), {'GAME': (5, 5.0, 0.0)}, replace=True)
+    assert [record[2] for record in store.query()] == [1, 4, 5]
@@ -0,0 +1,45 @@
+import os
+
+from app_profiles.duplicates import remove_duplicates
+from app_profiles.loading import iter_rows, read_header
+from app_profiles.validation import (ANDROID_CHECKS, WRONG_COLUMN_COUNT, Quarantine,
+                                     validate_rows)
+
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ANDROID_PATH = os.path.join(DATA_DIR, 'googleplaystore.csv')
+
+
+def app(name, rating='4.1', reviews='159', price='0'):
+    return [name, 'ART_AND_DESIGN', rating, reviews, '19M', '10,000+', 'Free', price,
+            'Everyone', 'Art & Design', 'January 7, 2018', '1.0.0', '4.0.3 and up']
+
+
+def test_rejects_the_notebook_row_10472_only():
+    quarantine = Quarantine()
+    rows = list(validate_rows(iter_rows(ANDROID_PATH), read_header(ANDROID_PATH),
+                              ANDROID_CHECKS, quarantine))
+    assert len(rows) == 10840
+    assert [position for source, position, row, reasons in quarantine.rejects] == [10472]
+
+
+def test_checks_match_the_later_parsers():
+    header = read_header(ANDROID_PATH)
+    rows = [
+        app('good'),
+        app('superscript', reviews='²'),
+        app('arabic digits', reviews='١٢'),
+        app('millions', reviews='3.0M'),
+        app('rating', rating='19'),
+        app('no rating', rating='NaN'),
+        app('price', price='Everyone'),
+        app('short')[:-1],
+    ]
+    quarantine = Quarantine()
+    kept = list(validate_rows(rows, header, ANDROID_CHECKS, quarantine))
+
+    assert [row[0] for row in kept] == ['good', 'no rating']
+    # Every row that passes can be parsed by the cleaning stages.
+    assert remove_duplicates(kept) == kept
+    reasons = {row[0]: reasons for source, position, row, reasons in quarantine.rejects}
+    assert reasons['superscript'] == ['non-numeric Reviews']
+    assert reasons['short'] == [WRONG_COLUMN_COUNT]